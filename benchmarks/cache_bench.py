@@ -0,0 +1,229 @@
+"""缓存层基准测试.
+
+默认使用进程内Redis替身（可注入往返延迟），也可连接真实Redis。在不同并发度下
+测试单键读写、逐键读取与批量读取、请求合并等路径的吞吐量和延迟分位数，
+并可输出JSON用于跟踪性能回归。
+
+用法::
+
+    python -m benchmarks.cache_bench --latency-ms 0.2 --concurrency 1,10,100,1000
+    python -m benchmarks.cache_bench --backend redis --json results.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from src.config.settings import settings
+from src.core.cache import CacheManager
+
+# 批量场景每次操作涉及的键数量
+BATCH_KEYS = 100
+# 每次操作涉及 BATCH_KEYS 个键的场景
+BATCH_SCENARIOS = ("loop_get", "get_many")
+# 预先写入的键数量
+KEYSPACE = 1000
+
+Operation = Callable[[int], Awaitable[Any]]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """计算分位数（最近秩法）.
+
+    Args:
+        samples: 样本列表
+        pct: 百分位（0-100）
+
+    Returns:
+        分位数值
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_concurrent(
+    operation: Operation, concurrency: int, ops: int
+) -> Dict[str, float]:
+    """以指定并发度执行操作并统计吞吐量和延迟.
+
+    Args:
+        operation: 被测操作，参数为操作序号
+        concurrency: 并发协程数
+        ops: 总操作次数
+
+    Returns:
+        统计结果
+    """
+    latencies: List[float] = []
+    errors = 0
+    # 所有协程共享同一个序号迭代器
+    sequence = iter(range(ops))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in sequence:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception:
+                # 例如连接池等待超时，计入错误数而不中断测试
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "ops": ops,
+        "errors": errors,
+        "ops_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+    }
+
+
+def build_scenarios(
+    cache: CacheManager, concurrency: int, compute_ms: float
+) -> Dict[str, Operation]:
+    """构建各测试场景.
+
+    Args:
+        cache: 缓存管理器
+        concurrency: 并发协程数
+        compute_ms: 请求合并场景中被缓存函数的计算耗时（毫秒）
+
+    Returns:
+        场景名称到操作的映射
+    """
+    keys = [f"bench:{i}" for i in range(KEYSPACE)]
+
+    def batch(i: int) -> List[str]:
+        start = (i * BATCH_KEYS) % KEYSPACE
+        return keys[start : start + BATCH_KEYS]
+
+    async def get(i: int) -> None:
+        await cache.get(keys[i % KEYSPACE])
+
+    async def set_(i: int) -> None:
+        await cache.set(keys[i % KEYSPACE], i)
+
+    async def loop_get(i: int) -> None:
+        for key in batch(i):
+            await cache.get(key)
+
+    async def get_many(i: int) -> None:
+        await cache.get_many(batch(i))
+
+    @cache.cached(ttl=60, key="bench:cached:{}:" + str(concurrency))
+    async def compute(wave: int) -> int:
+        await asyncio.sleep(compute_ms / 1000)
+        return wave
+
+    async def coalesced(i: int) -> None:
+        # 每一轮并发调用使用新的缓存键：一次计算，其余调用合并等待
+        await compute(i // concurrency)
+
+    return {
+        "get": get,
+        "set": set_,
+        "loop_get": loop_get,
+        "get_many": get_many,
+        "coalesced": coalesced,
+    }
+
+
+async def run_suite(
+    concurrency_levels: List[int], ops: int, compute_ms: float
+) -> List[Dict[str, Any]]:
+    """执行完整的基准测试.
+
+    Args:
+        concurrency_levels: 并发度列表
+        ops: 每个场景每个并发度的操作次数
+        compute_ms: 请求合并场景的计算耗时（毫秒）
+
+    Returns:
+        所有场景的统计结果
+    """
+    cache = CacheManager()
+    await cache.warmup()
+    await cache.set_many({f"bench:{i}": i for i in range(KEYSPACE)})
+
+    results = []
+    try:
+        for concurrency in concurrency_levels:
+            scenarios = build_scenarios(cache, concurrency, compute_ms)
+            for name, operation in scenarios.items():
+                # 批量场景每次操作涉及多个键，减少操作次数以控制总耗时
+                batched = name in BATCH_SCENARIOS
+                count = max(concurrency, ops // BATCH_KEYS) if batched else ops
+                stats = await run_concurrent(operation, concurrency, count)
+                results.append({"scenario": name, "concurrency": concurrency, **stats})
+    finally:
+        await cache.clear_namespace("bench")
+        await cache.disconnect()
+    return results
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description="缓存层基准测试")
+    parser.add_argument(
+        "--backend",
+        choices=["fake", "redis"],
+        default="fake",
+        help="fake 使用进程内替身，redis 使用 REDIS_URL 指向的实例",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.2, help="替身每次往返注入的延迟（毫秒）"
+    )
+    parser.add_argument(
+        "--concurrency", default="1,10,100,1000", help="逗号分隔的并发度列表"
+    )
+    parser.add_argument("--ops", type=int, default=2000, help="每个场景的操作次数")
+    parser.add_argument(
+        "--compute-ms", type=float, default=5.0, help="请求合并场景的计算耗时（毫秒）"
+    )
+    parser.add_argument("--pool-size", type=int, default=50, help="连接池最大连接数")
+    parser.add_argument(
+        "--pool-timeout", type=float, default=10.0, help="等待空闲连接的超时时间（秒）"
+    )
+    parser.add_argument("--json", dest="json_path", help="将结果写入JSON文件")
+    args = parser.parse_args()
+
+    if args.backend == "fake":
+        settings.REDIS_MODE = "fake"
+        settings.REDIS_FAKE_LATENCY = args.latency_ms / 1000
+    settings.REDIS_POOL_MAX_SIZE = args.pool_size
+    settings.REDIS_POOL_TIMEOUT = args.pool_timeout
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    results = asyncio.run(run_suite(levels, args.ops, args.compute_ms))
+
+    print(
+        f"{'scenario':<10} {'conc':>5} {'ops':>6} {'errors':>6} "
+        f"{'ops/sec':>10} {'p50_ms':>8} {'p99_ms':>8}"
+    )
+    for row in results:
+        print(
+            f"{row['scenario']:<10} {row['concurrency']:>5} {row['ops']:>6} "
+            f"{row['errors']:>6} "
+            f"{row['ops_per_sec']:>10.1f} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}"
+        )
+
+    if args.json_path:
+        report = {
+            "backend": args.backend,
+            "latency_ms": args.latency_ms if args.backend == "fake" else None,
+            "pool_size": args.pool_size,
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""缓存序列化基准测试.
+
+对比各编解码器与压缩算法组合的编码/解码耗时及编码后字节数，
+未安装的可选依赖会被跳过。
+
+用法::
+
+    python -m benchmarks.codec_bench --rounds 2000
+"""
+import argparse
+import time
+from typing import Any, Dict, List
+
+from src.core.serialization import CODECS, COMPRESSORS, Serializer
+
+# 典型缓存值：小对象、列表记录和较大的文本
+SAMPLES: Dict[str, Any] = {
+    "small": {"id": 42, "name": "alice", "active": True},
+    "records": [
+        {"id": i, "name": f"user-{i}", "score": i * 1.5, "tags": ["a", "b"]}
+        for i in range(200)
+    ],
+    "text": {"body": "缓存序列化基准测试 " * 2000},
+}
+
+
+def bench(rounds: int) -> List[Dict[str, Any]]:
+    """执行所有编解码器与压缩组合的基准测试.
+
+    Args:
+        rounds: 每个组合的执行轮数
+
+    Returns:
+        每个组合的测试结果
+    """
+    results = []
+    for codec in CODECS:
+        for compression in COMPRESSORS:
+            serializer = Serializer(codec, compression, compression_threshold=512)
+            for sample_name, value in SAMPLES.items():
+                try:
+                    payload = serializer.dumps(value)
+                except RuntimeError:
+                    # 缺少可选依赖
+                    continue
+
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    serializer.dumps(value)
+                encode_us = (time.perf_counter() - start) * 1e6 / rounds
+
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    serializer.loads(payload)
+                decode_us = (time.perf_counter() - start) * 1e6 / rounds
+
+                results.append(
+                    {
+                        "codec": codec,
+                        "compression": compression,
+                        "sample": sample_name,
+                        "bytes": len(payload),
+                        "encode_us": encode_us,
+                        "decode_us": decode_us,
+                    }
+                )
+    return results
+
+
+def main() -> None:
+    """命令行入口."""
+    parser = argparse.ArgumentParser(description="缓存序列化基准测试")
+    parser.add_argument("--rounds", type=int, default=2000, help="每个组合的执行轮数")
+    args = parser.parse_args()
+
+    print(
+        f"{'codec':<8} {'compress':<8} {'sample':<8} "
+        f"{'bytes':>8} {'encode_us':>10} {'decode_us':>10}"
+    )
+    for row in bench(args.rounds):
+        print(
+            f"{row['codec']:<8} {row['compression']:<8} {row['sample']:<8} "
+            f"{row['bytes']:>8} {row['encode_us']:>10.2f} {row['decode_us']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
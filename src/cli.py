@@ -1,14 +1,20 @@
 """命令行工具示例."""
 import asyncio
+import importlib
+import signal
 import sys
-from typing import Optional
+import time
+from typing import Optional, Tuple
 
 import click
 from rich.console import Console
 from rich.table import Table
 
+from src.config.settings import settings
 from src.core.cache import cache
 from src.core.database import db
+from src.core.query_profiler import QueryProfiler
+from src.core.tasks import task_manager
 from src.monitoring import health
 from src.utils.logging import configure_logging, get_logger
 
@@ -57,26 +63,31 @@ def status() -> None:
 @click.argument("key")
 @click.argument("value", required=False)
 @click.option("--ttl", type=int, help="缓存过期时间（秒）")
-def cache_op(key: str, value: Optional[str], ttl: Optional[int]) -> None:
+@click.option("--namespace", help="缓存命名空间")
+def cache_op(
+    key: str, value: Optional[str], ttl: Optional[int], namespace: Optional[str]
+) -> None:
     """缓存操作.
 
     Args:
         key: 缓存键
         value: 缓存值（如果不提供则为获取操作）
         ttl: 过期时间
+        namespace: 缓存命名空间
     """
+    target = cache.namespace(namespace) if namespace else cache
 
     async def _cache_op() -> None:
         if value is None:
             # 获取缓存
-            result = await cache.get(key)
+            result = await target.get(key)
             if result is None:
                 console.print(f"键 [cyan]{key}[/cyan] 不存在")
             else:
                 console.print(f"键 [cyan]{key}[/cyan] 的值为: [green]{result}[/green]")
         else:
             # 设置缓存
-            await cache.set(key, value, expire=ttl)
+            await target.set(key, value, expire=ttl)
             console.print(
                 f"已设置键 [cyan]{key}[/cyan] 的值为: [green]{value}[/green]"
                 f"{f'，过期时间为 {ttl} 秒' if ttl else ''}"
@@ -90,21 +101,115 @@ def cache_op(key: str, value: Optional[str], ttl: Optional[int]) -> None:
 
 
 @cli.command()
-def clear_cache() -> None:
-    """清除所有缓存."""
-
-    async def _clear_cache() -> None:
-        if cache._redis is None:
-            await cache.connect()
-        await cache._redis.flushall()  # type: ignore
+@click.argument("namespace")
+def clear_cache(namespace: str) -> None:
+    """清除指定命名空间的缓存.
 
+    Args:
+        namespace: 缓存命名空间
+    """
     try:
-        asyncio.run(_clear_cache())
-        console.print("[green]缓存已清除[/green]")
+        start = time.perf_counter()
+        removed = asyncio.run(cache.clear_namespace(namespace))
+        elapsed = time.perf_counter() - start
+        console.print(
+            f"[green]已清除命名空间 [cyan]{namespace}[/cyan] 的 {removed} 个键，"
+            f"耗时 {elapsed:.3f} 秒[/green]"
+        )
     except Exception as e:
         logger.error("清除缓存失败", exc_info=e)
         sys.exit(1)
 
 
+@cli.command()
+@click.option("--top", "limit", type=int, default=10, help="显示的指纹数量")
+@click.option(
+    "--order-by",
+    type=click.Choice(["total_time", "mean_time", "max_time", "calls"]),
+    default="total_time",
+    help="排序字段",
+)
+@click.option("--file", "path", help="统计文件路径，默认为 DB_QUERY_STATS_FILE")
+def query_report(limit: int, order_by: str, path: Optional[str]) -> None:
+    """显示最耗时的SQL指纹.
+
+    Args:
+        limit: 显示的指纹数量
+        order_by: 排序字段
+        path: 统计文件路径
+    """
+    path = path or settings.DB_QUERY_STATS_FILE
+    if not path:
+        console.print(
+            "[red]未指定统计文件，请设置 DB_QUERY_STATS_FILE 或使用 --file[/red]"
+        )
+        sys.exit(1)
+
+    try:
+        stats = QueryProfiler.load(path)
+    except Exception as e:
+        logger.error("读取查询统计失败", exc_info=e)
+        sys.exit(1)
+
+    table = Table(title=f"最耗时的 {limit} 个查询")
+    table.add_column("指纹", style="cyan")
+    table.add_column("调用次数", justify="right")
+    table.add_column("总耗时(s)", justify="right")
+    table.add_column("平均(ms)", justify="right")
+    table.add_column("最大(ms)", justify="right")
+    table.add_column("SQL")
+    stats.sort(key=lambda s: getattr(s, order_by), reverse=True)
+    for row in stats[:limit]:
+        table.add_row(
+            row.fingerprint,
+            str(row.calls),
+            f"{row.total_time:.3f}",
+            f"{row.mean_time * 1000:.2f}",
+            f"{row.max_time * 1000:.2f}",
+            row.statement,
+        )
+    console.print(table)
+
+
+@cli.command()
+@click.option(
+    "--module",
+    "modules",
+    multiple=True,
+    default=["src.tasks_demo"],
+    help="注册持久化任务的模块，可指定多次",
+)
+@click.option("--concurrency", type=int, help="同时执行的任务数")
+def worker(modules: Tuple[str, ...], concurrency: Optional[int]) -> None:
+    """启动后台任务工作进程.
+
+    Args:
+        modules: 注册持久化任务的模块
+        concurrency: 同时执行的任务数
+    """
+    if settings.TASK_QUEUE_BACKEND == "memory":
+        # 内存队列只在当前进程内可见，独立的工作进程拿不到其他进程提交的任务
+        console.print(
+            "[red]memory 任务队列不能用于独立的工作进程，"
+            "请将 TASK_QUEUE_BACKEND 设置为 sqlite 或 redis[/red]"
+        )
+        sys.exit(1)
+
+    for module in modules:
+        importlib.import_module(module)
+
+    async def _worker() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            await task_manager.run_worker(concurrency, stop)
+        finally:
+            await task_manager.shutdown()
+
+    asyncio.run(_worker())
+
+
 if __name__ == "__main__":
     cli()
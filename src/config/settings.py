@@ -1,5 +1,4 @@
 """Global settings configuration."""
-
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -29,6 +28,122 @@ class Settings(BaseSettings):
         default=["en", "zh"], env="SUPPORTED_LANGUAGES"
     )
 
+    # Database
+    DATABASE_URL: str = Field(
+        default="sqlite+aiosqlite:///./app.db", env="DATABASE_URL"
+    )
+    DATABASE_REPLICA_URLS: list[str] = Field(default=[], env="DATABASE_REPLICA_URLS")
+    SQL_DEBUG: bool = Field(default=False, env="SQL_DEBUG")
+    DB_POOL_SIZE: int = Field(default=5, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    DB_POOL_CLASS: str = Field(default="queue", env="DB_POOL_CLASS")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(default=True, env="DB_POOL_PRE_PING")
+    DB_POOL_USE_LIFO: bool = Field(default=False, env="DB_POOL_USE_LIFO")
+    DB_SLOW_CHECKOUT_THRESHOLD: float = Field(
+        default=0.0, env="DB_SLOW_CHECKOUT_THRESHOLD"
+    )
+    DB_PROFILE_QUERIES: bool = Field(default=True, env="DB_PROFILE_QUERIES")
+    DB_SLOW_QUERY_THRESHOLD: float = Field(default=0.5, env="DB_SLOW_QUERY_THRESHOLD")
+    DB_QUERY_FINGERPRINT_LIMIT: int = Field(
+        default=200, env="DB_QUERY_FINGERPRINT_LIMIT"
+    )
+    DB_QUERY_STATS_FILE: Optional[str] = Field(default=None, env="DB_QUERY_STATS_FILE")
+    DB_BULK_CHUNK_SIZE: int = Field(default=1000, env="DB_BULK_CHUNK_SIZE")
+    DB_STREAM_BATCH_SIZE: int = Field(default=1000, env="DB_STREAM_BATCH_SIZE")
+    DB_QUERY_CACHE_SIZE: int = Field(default=500, env="DB_QUERY_CACHE_SIZE")
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(
+        default=100, env="DB_PREPARED_STATEMENT_CACHE_SIZE"
+    )
+    DB_HEALTH_CHECK_INTERVAL: float = Field(default=5.0, env="DB_HEALTH_CHECK_INTERVAL")
+    DB_HEALTH_CHECK_TIMEOUT: float = Field(default=1.0, env="DB_HEALTH_CHECK_TIMEOUT")
+    DB_RESULT_CACHE_BACKEND: str = Field(
+        default="memory", env="DB_RESULT_CACHE_BACKEND"
+    )
+    DB_RESULT_CACHE_TTL: int = Field(default=60, env="DB_RESULT_CACHE_TTL")
+    DB_RESULT_CACHE_MAX_SIZE: int = Field(default=1024, env="DB_RESULT_CACHE_MAX_SIZE")
+    DB_REPLICA_STRATEGY: str = Field(default="round_robin", env="DB_REPLICA_STRATEGY")
+    DB_REPLICA_MAX_LAG: float = Field(default=5.0, env="DB_REPLICA_MAX_LAG")
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = Field(
+        default=10.0, env="DB_REPLICA_LAG_CHECK_INTERVAL"
+    )
+
+    # Cache
+    REDIS_MODE: str = Field(default="standalone", env="REDIS_MODE")
+    REDIS_URL: str = Field(default="redis://localhost:6379/0", env="REDIS_URL")
+    REDIS_SENTINELS: list[str] = Field(default=[], env="REDIS_SENTINELS")
+    REDIS_SENTINEL_SERVICE: str = Field(
+        default="mymaster", env="REDIS_SENTINEL_SERVICE"
+    )
+    REDIS_FAKE_LATENCY: float = Field(default=0.0, env="REDIS_FAKE_LATENCY")
+    REDIS_POOL_MIN_SIZE: int = Field(default=1, env="REDIS_POOL_MIN_SIZE")
+    REDIS_POOL_MAX_SIZE: int = Field(default=10, env="REDIS_POOL_MAX_SIZE")
+    REDIS_POOL_TIMEOUT: float = Field(default=2.0, env="REDIS_POOL_TIMEOUT")
+    REDIS_SOCKET_TIMEOUT: float = Field(default=1.0, env="REDIS_SOCKET_TIMEOUT")
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = Field(
+        default=1.0, env="REDIS_SOCKET_CONNECT_TIMEOUT"
+    )
+    REDIS_SOCKET_KEEPALIVE: bool = Field(default=True, env="REDIS_SOCKET_KEEPALIVE")
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(
+        default=30, env="REDIS_HEALTH_CHECK_INTERVAL"
+    )
+    REDIS_RETRY_ON_TIMEOUT: bool = Field(default=True, env="REDIS_RETRY_ON_TIMEOUT")
+    REDIS_RETRIES: int = Field(default=2, env="REDIS_RETRIES")
+    CACHE_LOCAL_ENABLED: bool = Field(default=False, env="CACHE_LOCAL_ENABLED")
+    CACHE_LOCAL_MAX_SIZE: int = Field(default=1024, env="CACHE_LOCAL_MAX_SIZE")
+    CACHE_LOCAL_TTL: float = Field(default=30.0, env="CACHE_LOCAL_TTL")
+    CACHE_LOCAL_POLICY: str = Field(default="lru", env="CACHE_LOCAL_POLICY")
+    CACHE_CODEC: str = Field(default="json", env="CACHE_CODEC")
+    CACHE_COMPRESSION: Optional[str] = Field(default=None, env="CACHE_COMPRESSION")
+    CACHE_COMPRESSION_THRESHOLD: int = Field(
+        default=1024, env="CACHE_COMPRESSION_THRESHOLD"
+    )
+    CACHE_REPLICA_READ_PREFIXES: list[str] = Field(
+        default=[], env="CACHE_REPLICA_READ_PREFIXES"
+    )
+    CACHE_TTL_JITTER: float = Field(default=0.0, env="CACHE_TTL_JITTER")
+    CACHE_BATCH_SIZE: int = Field(default=500, env="CACHE_BATCH_SIZE")
+    CACHE_INVALIDATION_CHANNEL: str = Field(
+        default="cache:invalidate", env="CACHE_INVALIDATION_CHANNEL"
+    )
+
+    # Tasks
+    TASK_QUEUE_BACKEND: str = Field(default="sqlite", env="TASK_QUEUE_BACKEND")
+    TASK_QUEUE_NAME: str = Field(default="tasks", env="TASK_QUEUE_NAME")
+    TASK_QUEUE_GROUP: str = Field(default="workers", env="TASK_QUEUE_GROUP")
+    TASK_QUEUE_SQLITE_PATH: str = Field(
+        default="./tasks.db", env="TASK_QUEUE_SQLITE_PATH"
+    )
+    TASK_QUEUE_POLL_INTERVAL: float = Field(default=0.5, env="TASK_QUEUE_POLL_INTERVAL")
+    TASK_VISIBILITY_TIMEOUT: float = Field(default=300.0, env="TASK_VISIBILITY_TIMEOUT")
+    TASK_WORKER_CONCURRENCY: int = Field(default=10, env="TASK_WORKER_CONCURRENCY")
+    TASK_MAX_DELIVERIES: int = Field(default=5, env="TASK_MAX_DELIVERIES")
+    TASK_DEAD_LETTER_MAX_SIZE: int = Field(
+        default=10000, env="TASK_DEAD_LETTER_MAX_SIZE"
+    )
+    TASK_MAX_CONCURRENCY: int = Field(default=100, env="TASK_MAX_CONCURRENCY")
+    TASK_SUBMIT_QUEUE_SIZE: int = Field(default=1000, env="TASK_SUBMIT_QUEUE_SIZE")
+    TASK_SUBMIT_OVERFLOW: str = Field(default="block", env="TASK_SUBMIT_OVERFLOW")
+    TASK_THREAD_POOL_SIZE: int = Field(default=8, env="TASK_THREAD_POOL_SIZE")
+    TASK_PROCESS_POOL_SIZE: int = Field(default=4, env="TASK_PROCESS_POOL_SIZE")
+    TASK_SHUTDOWN_TIMEOUT: float = Field(default=30.0, env="TASK_SHUTDOWN_TIMEOUT")
+    TASK_HISTORY_SIZE: int = Field(default=1000, env="TASK_HISTORY_SIZE")
+    TASK_RETRY_MAX_DELAY: float = Field(default=300.0, env="TASK_RETRY_MAX_DELAY")
+    TASK_RETRY_BUDGET_RATIO: float = Field(default=0.2, env="TASK_RETRY_BUDGET_RATIO")
+    TASK_RETRY_BUDGET_MIN_PER_SECOND: float = Field(
+        default=1.0, env="TASK_RETRY_BUDGET_MIN_PER_SECOND"
+    )
+    TASK_RETRY_BUDGET_CAPACITY: float = Field(
+        default=10.0, env="TASK_RETRY_BUDGET_CAPACITY"
+    )
+    TASK_BREAKER_ERROR_RATE: float = Field(default=0.5, env="TASK_BREAKER_ERROR_RATE")
+    TASK_BREAKER_WINDOW: int = Field(default=20, env="TASK_BREAKER_WINDOW")
+    TASK_BREAKER_MIN_CALLS: int = Field(default=10, env="TASK_BREAKER_MIN_CALLS")
+    TASK_BREAKER_RESET_TIMEOUT: float = Field(
+        default=30.0, env="TASK_BREAKER_RESET_TIMEOUT"
+    )
+
     # API Configuration
     API_V1_PREFIX: str = "/api/v1"
     API_TITLE: str = "Project API"
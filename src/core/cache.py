@@ -1,69 +1,478 @@
 """缓存管理模块."""
-from typing import Any, Optional
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-import aioredis
-from aioredis import Redis
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis, RedisCluster
+from redis.asyncio.client import PubSub
+from redis.asyncio.connection import parse_url
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel
+from redis.backoff import ExponentialBackoff
 
 from src.config.settings import settings
+from src.core.fake_redis import create_fake_redis
+from src.core.serialization import Serializer
+from src.monitoring.metrics import metrics
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# 本地缓存未命中标记（缓存值本身可能为None）
+_MISSING = object()
+
+# 缓存命中统计
+cache_requests = metrics.counter(
+    "cache_requests_total", "Cache lookups by tier and result", ["tier", "result"]
+)
+
+# 连接池使用情况，在采集时读取
+redis_pool_connections = metrics.gauge(
+    "redis_pool_connections", "Redis pool connections by state", ["state"]
+)
+
+# 缓存装饰器统计
+cached_calls = metrics.counter(
+    "cache_decorator_calls_total",
+    "Cached function calls by result (hit/early/stale/miss/coalesced)",
+    ["function", "result"],
+)
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """按固定大小切分列表.
+
+    Args:
+        items: 待切分的列表
+        size: 每块大小
+
+    Yields:
+        切分后的子列表
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _parse_address(address: str) -> Tuple[str, int]:
+    """解析 host:port 格式的地址.
+
+    Args:
+        address: 地址字符串
+
+    Returns:
+        主机和端口
+    """
+    host, _, port = address.rpartition(":")
+    return host, int(port)
+
+
+def _jitter(seconds: Optional[float]) -> Optional[float]:
+    """按 CACHE_TTL_JITTER 随机延长过期时间，避免同批写入的键同时过期.
+
+    Args:
+        seconds: 过期时间（秒）
+
+    Returns:
+        加入随机抖动后的过期时间
+    """
+    if seconds is None or not settings.CACHE_TTL_JITTER:
+        return seconds
+    return seconds * (1 + random.uniform(0, settings.CACHE_TTL_JITTER))
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[int]:
+    """将秒转换为毫秒，用于SET的PX参数.
+
+    Args:
+        seconds: 过期时间（秒）
+
+    Returns:
+        过期时间（毫秒）
+    """
+    return None if seconds is None else max(1, int(seconds * 1000))
+
+
+def _escape_glob(pattern: str) -> str:
+    """转义Redis glob模式中的特殊字符.
+
+    Args:
+        pattern: 原始字符串
+
+    Returns:
+        可安全用于SCAN MATCH的字符串
+    """
+    for char in "\\*?[]":
+        pattern = pattern.replace(char, "\\" + char)
+    return pattern
+
+
+class LocalCache:
+    """进程内缓存（L1层），位于Redis之前.
+
+    CacheManager 存入与Redis相同的序列化字节串，每次命中都解码出新对象，
+    调用方修改返回值不会影响缓存，结果也与从Redis读取时一致。
+    """
+
+    def __init__(self, max_size: int, ttl: float, policy: str = "lru") -> None:
+        """初始化本地缓存.
+
+        Args:
+            max_size: 最大条目数
+            ttl: 默认过期时间（秒）
+            policy: 淘汰策略，支持 lru 和 fifo
+        """
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"Unsupported eviction policy: {policy}")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._policy = policy
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """返回当前条目数."""
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        """获取缓存值.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，不存在或已过期时返回 _MISSING
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        if self._policy == "lru":
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """设置缓存值.
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间（秒），不会超过本地缓存的默认过期时间
+        """
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """删除缓存值.
+
+        Args:
+            key: 缓存键
+        """
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """删除指定前缀的所有缓存值.
+
+        Args:
+            prefix: 键前缀
+        """
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        """清空本地缓存."""
+        self._data.clear()
+
 
 class CacheManager:
     """缓存管理器."""
 
     def __init__(self) -> None:
         """初始化缓存管理器."""
-        self._redis: Optional[Redis] = None
+        self._redis: Union[Redis, RedisCluster, None] = None
+        self._serializer = Serializer(
+            settings.CACHE_CODEC,
+            settings.CACHE_COMPRESSION,
+            settings.CACHE_COMPRESSION_THRESHOLD,
+        )
+        self._local: Optional[LocalCache] = None
+        if settings.CACHE_LOCAL_ENABLED:
+            self._local = LocalCache(
+                settings.CACHE_LOCAL_MAX_SIZE,
+                settings.CACHE_LOCAL_TTL,
+                settings.CACHE_LOCAL_POLICY,
+            )
+        # 用于在失效广播中识别本实例发出的消息
+        self._instance_id = uuid.uuid4().hex
+        # 只读副本客户端，用于 CACHE_REPLICA_READ_PREFIXES 匹配的键
+        self._replica: Union[Redis, RedisCluster, None] = None
+        self._pubsub_client: Optional[Redis] = None
+        self._pubsub: Optional[PubSub] = None
+        self._listener: Optional[asyncio.Task] = None
+        # 正在进行的计算，按缓存键合并并发请求
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._connect_lock = asyncio.Lock()
+        self._warmed_up = False
 
     async def connect(self) -> None:
-        """建立Redis连接."""
+        """建立Redis连接.
+
+        并发调用时只会创建一组客户端，其余调用等待其完成。
+        """
         if self._redis is not None:
             return
 
-        self._redis = await aioredis.create_redis_pool(
-            settings.REDIS_URL,
-            minsize=settings.REDIS_POOL_MIN_SIZE,
-            maxsize=settings.REDIS_POOL_MAX_SIZE,
-            encoding="utf-8",
-        )
-        logger.info("Redis connection established")
+        async with self._connect_lock:
+            # 等待锁期间可能已由其他协程完成连接
+            if self._redis is not None:
+                return
+
+            client, replica = self._create_clients()
+            try:
+                if self._local is not None:
+                    await self._start_invalidation_listener(client)
+            except Exception:
+                await client.aclose()
+                if replica is not None:
+                    await replica.aclose()
+                raise
+
+            # 集群模式下每个节点各有连接池，不导出单一连接池指标
+            if isinstance(client, Redis):
+                self._export_pool_metrics(client.connection_pool)
+            # 初始化完成后再赋值，快速路径上的调用不会拿到半初始化的客户端
+            self._replica = replica
+            self._redis = client
+            logger.info("Redis connection established", mode=settings.REDIS_MODE)
+
+    def _create_clients(
+        self,
+    ) -> Tuple[Union[Redis, RedisCluster], Union[Redis, RedisCluster, None]]:
+        """按 REDIS_MODE 创建主客户端和只读副本客户端.
+
+        Returns:
+            主客户端和副本客户端（未配置 CACHE_REPLICA_READ_PREFIXES 时为None）
+        """
+        replica: Union[Redis, RedisCluster, None] = None
+        mode = settings.REDIS_MODE
+        if mode == "standalone":
+            # 阻塞式连接池：连接耗尽时等待至多 REDIS_POOL_TIMEOUT 秒而不是立即报错
+            pool = BlockingConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_POOL_MAX_SIZE,
+                timeout=settings.REDIS_POOL_TIMEOUT,
+                retry_on_timeout=settings.REDIS_RETRY_ON_TIMEOUT,
+                **self._connection_kwargs(),
+            )
+            client = Redis.from_pool(pool)
+        elif mode == "cluster":
+            client = RedisCluster.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_POOL_MAX_SIZE,
+                **self._connection_kwargs(),
+            )
+            if settings.CACHE_REPLICA_READ_PREFIXES:
+                replica = RedisCluster.from_url(
+                    settings.REDIS_URL,
+                    max_connections=settings.REDIS_POOL_MAX_SIZE,
+                    read_from_replicas=True,
+                    **self._connection_kwargs(),
+                )
+        elif mode == "sentinel":
+            sentinel = Sentinel(
+                [_parse_address(address) for address in settings.REDIS_SENTINELS],
+                sentinel_kwargs=self._connection_kwargs(),
+                **self._connection_kwargs(),
+            )
+            # 数据库编号和认证信息沿用 REDIS_URL
+            auth = {
+                k: v
+                for k, v in parse_url(settings.REDIS_URL).items()
+                if k in ("db", "username", "password")
+            }
+            client = sentinel.master_for(
+                settings.REDIS_SENTINEL_SERVICE,
+                max_connections=settings.REDIS_POOL_MAX_SIZE,
+                **auth,
+            )
+            if settings.CACHE_REPLICA_READ_PREFIXES:
+                replica = sentinel.slave_for(
+                    settings.REDIS_SENTINEL_SERVICE,
+                    max_connections=settings.REDIS_POOL_MAX_SIZE,
+                    **auth,
+                )
+        elif mode == "fake":
+            # 进程内替身，用于CI测试和基准测试
+            client = create_fake_redis(
+                settings.REDIS_FAKE_LATENCY,
+                settings.REDIS_POOL_MAX_SIZE,
+                settings.REDIS_POOL_TIMEOUT,
+            )
+        else:
+            raise ValueError(f"Unsupported Redis mode: {mode}")
+
+        return client, replica
+
+    async def client(self) -> Union[Redis, RedisCluster]:
+        """返回已连接的Redis客户端，用于缓存以外的数据结构（如任务队列）.
+
+        Returns:
+            Redis客户端
+        """
+        if self._redis is None:
+            await self.connect()
+        return self._redis  # type: ignore
+
+    async def warmup(self, n: Optional[int] = None) -> None:
+        """预热连接池.
+
+        提前建立并PING至少 n 个连接，使部署后的首批请求不必承担建连延迟。
+
+        Args:
+            n: 预热连接数，默认为 REDIS_POOL_MIN_SIZE
+        """
+        await self.connect()
+        n = settings.REDIS_POOL_MIN_SIZE if n is None else n
+        clients = [self._redis] + ([self._replica] if self._replica else [])
+        for client in clients:
+            if isinstance(client, RedisCluster):
+                await client.initialize()
+                await asyncio.gather(
+                    *(
+                        client.ping(target_nodes=RedisCluster.ALL_NODES)
+                        for _ in range(n)
+                    )
+                )
+                continue
+            pool = client.connection_pool  # type: ignore
+            # 同时持有 n 个连接，确保连接池真正建立 n 个连接
+            connections = [
+                await pool.get_connection() for _ in range(min(n, pool.max_connections))
+            ]
+            try:
+                for connection in connections:
+                    await connection.send_command("PING")
+                await asyncio.gather(
+                    *(connection.read_response() for connection in connections)
+                )
+            finally:
+                for connection in connections:
+                    await pool.release(connection)
+        self._warmed_up = True
+        logger.info("Redis connection pool warmed up", connections=n)
 
     async def disconnect(self) -> None:
         """关闭Redis连接."""
         if self._redis is None:
             return
+        self._warmed_up = False
+
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        if self._pubsub_client is not None:
+            await self._pubsub_client.aclose()
+            self._pubsub_client = None
+        if self._local is not None:
+            self._local.clear()
 
-        self._redis.close()
-        await self._redis.wait_closed()
+        if self._replica is not None:
+            await self._replica.aclose()
+            self._replica = None
+        await self._redis.aclose()
         self._redis = None
         logger.info("Redis connection closed")
 
     async def get(self, key: str) -> Any:
         """获取缓存值.
 
+        启用本地缓存时先查询进程内缓存，未命中再访问Redis并回填。
+
         Args:
             key: 缓存键
 
         Returns:
             缓存值
         """
+        if self._local is not None:
+            payload = self._local.get(key)
+            if payload is not _MISSING:
+                cache_requests.labels(tier="local", result="hit").inc()
+                return self._serializer.loads(payload)
+            cache_requests.labels(tier="local", result="miss").inc()
+
         if self._redis is None:
             await self.connect()
-        return await self._redis.get(key)  # type: ignore
+        payload = await self._reader(key).get(key)
+        value = self._serializer.loads(payload)
+        cache_requests.labels(
+            tier="redis", result="miss" if value is None else "hit"
+        ).inc()
+
+        if value is not None and self._local is not None:
+            self._local.set(key, payload)
+        return value
 
     async def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
         """设置缓存值.
 
+        配置了 CACHE_TTL_JITTER 时过期时间会加入随机抖动。
+
         Args:
             key: 缓存键
             value: 缓存值
             expire: 过期时间（秒）
         """
+        await self._store(key, value, _jitter(expire))
+
+    async def _store(self, key: str, value: Any, ttl: Optional[float]) -> None:
+        """按给定的过期时间写入缓存，不再加入抖动.
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 过期时间（秒）
+        """
         if self._redis is None:
             await self.connect()
-        await self._redis.set(key, value, expire=expire)  # type: ignore
+        payload = self._serializer.dumps(value)
+        await self._redis.set(key, payload, px=_to_ms(ttl))  # type: ignore
+
+        if self._local is not None:
+            self._local.set(key, payload, ttl)
+            await self._publish_invalidation([key])
 
     async def delete(self, key: str) -> None:
         """删除缓存值.
@@ -75,21 +484,624 @@ class CacheManager:
             await self.connect()
         await self._redis.delete(key)  # type: ignore
 
+        if self._local is not None:
+            self._local.delete(key)
+            await self._publish_invalidation([key])
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """批量获取缓存值.
+
+        本地缓存未命中的键按批大小（集群模式下先按哈希槽分组）拆成多个MGET，
+        通过管道一次发送；集群模式下各节点的管道并行执行。
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            键到缓存值的映射，不存在的键对应None
+        """
+        result, pending = self._get_many_local(keys)
+        if not pending:
+            return result
+        if self._redis is None:
+            await self.connect()
+
+        fetched = await self._mget_routed(pending)
+        hits = self._store_fetched(fetched, result)
+        cache_requests.labels(tier="redis", result="hit").inc(hits)
+        cache_requests.labels(tier="redis", result="miss").inc(len(pending) - hits)
+        return result
+
+    def _get_many_local(self, keys: Iterable[str]) -> Tuple[Dict[str, Any], List[str]]:
+        """从本地缓存批量读取.
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            (本地命中的键值映射, 需要从Redis读取的去重后的键)
+        """
+        result: Dict[str, Any] = {}
+        pending: List[str] = []
+        for key in dict.fromkeys(keys):
+            if self._local is not None:
+                payload = self._local.get(key)
+                if payload is not _MISSING:
+                    cache_requests.labels(tier="local", result="hit").inc()
+                    result[key] = self._serializer.loads(payload)
+                    continue
+                cache_requests.labels(tier="local", result="miss").inc()
+            pending.append(key)
+        return result, pending
+
+    async def _mget_routed(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """按读取客户端（主节点或副本）分组后并行执行MGET.
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            每个客户端返回的键到原始字节串的映射
+        """
+        groups: Dict[int, Tuple[Any, List[str]]] = {}
+        for key in keys:
+            reader = self._reader(key)
+            groups.setdefault(id(reader), (reader, []))[1].append(key)
+        return await asyncio.gather(
+            *(self._mget(reader, group) for reader, group in groups.values())
+        )
+
+    def _store_fetched(
+        self, fetched: List[Dict[str, Any]], result: Dict[str, Any]
+    ) -> int:
+        """解码从Redis读取的值写入结果，并回填本地缓存.
+
+        Args:
+            fetched: _mget_routed() 的返回值
+            result: 写入解码结果的映射
+
+        Returns:
+            命中的键数量
+        """
+        hits = 0
+        for raw_values in fetched:
+            for key, raw in raw_values.items():
+                value = self._serializer.loads(raw)
+                result[key] = value
+                if value is not None:
+                    hits += 1
+                    if self._local is not None:
+                        self._local.set(key, raw)
+        return hits
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+    ) -> None:
+        """批量设置缓存值.
+
+        无过期时间时每批使用一个MSET，否则逐键发送SET，所有命令通过管道发送。
+
+        Args:
+            items: 键到缓存值的映射
+            expire: 统一的过期时间（秒），或键到过期时间的映射
+        """
+        if not items:
+            return
+        if self._redis is None:
+            await self.connect()
+
+        def _expire_of(key: str) -> Optional[float]:
+            if isinstance(expire, dict):
+                return _jitter(expire.get(key))
+            return _jitter(expire)
+
+        keys = list(items)
+        payloads = {key: self._serializer.dumps(value) for key, value in items.items()}
+        ttls: Dict[str, Optional[float]] = {}
+        async with self._redis.pipeline(transaction=False) as pipe:  # type: ignore
+            for batch in self._key_batches(keys):
+                if expire is None:
+                    pipe.mset({key: payloads[key] for key in batch})
+                else:
+                    for key in batch:
+                        ttls[key] = _expire_of(key)
+                        pipe.set(key, payloads[key], px=_to_ms(ttls[key]))
+            await pipe.execute()
+
+        if self._local is not None:
+            for key in keys:
+                self._local.set(key, payloads[key], ttls.get(key))
+            await self._publish_invalidation(keys)
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """批量删除缓存值.
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            实际删除的键数量
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        if self._redis is None:
+            await self.connect()
+
+        async with self._redis.pipeline(transaction=False) as pipe:  # type: ignore
+            for batch in self._key_batches(keys):
+                pipe.delete(*batch)
+            deleted = sum(await pipe.execute())
+
+        if self._local is not None:
+            for key in keys:
+                self._local.delete(key)
+            await self._publish_invalidation(keys)
+        return deleted
+
+    def namespace(self, name: str) -> "CacheNamespace":
+        """获取命名空间视图.
+
+        Args:
+            name: 命名空间名称
+
+        Returns:
+            键自动加上 "name:" 前缀的缓存视图
+        """
+        return CacheNamespace(self, name)
+
+    async def clear_namespace(self, name: str) -> int:
+        """清除命名空间下的所有键.
+
+        通过SCAN增量遍历匹配的键并分批UNLINK（内存在后台释放），
+        不会像FLUSHALL那样阻塞Redis或影响其他命名空间的数据。
+
+        Args:
+            name: 命名空间名称
+
+        Returns:
+            删除的键数量
+        """
+        if self._redis is None:
+            await self.connect()
+
+        prefix = f"{name}:"
+        removed = 0
+        batch: List[Any] = []
+        async for key in self._redis.scan_iter(  # type: ignore
+            match=_escape_glob(prefix) + "*", count=settings.CACHE_BATCH_SIZE
+        ):
+            batch.append(key)
+            if len(batch) >= settings.CACHE_BATCH_SIZE:
+                removed += await self._unlink(batch)
+                batch = []
+        if batch:
+            removed += await self._unlink(batch)
+
+        if self._local is not None:
+            self._local.delete_prefix(prefix)
+            await self._publish_invalidation([], prefixes=[prefix])
+        return removed
+
+    def cached(
+        self,
+        ttl: int,
+        key: Union[str, Callable[..., str], None] = None,
+        stale_ttl: int = 0,
+        beta: float = 0.0,
+    ) -> Callable:
+        """异步函数结果缓存装饰器.
+
+        同一进程内对同一缓存键的并发未命中只触发一次计算。设置 stale_ttl 后，
+        已过新鲜期但仍在宽限期内的值会直接返回，同时在后台刷新。
+
+        设置 beta 后启用XFetch概率提前刷新：缓存中同时记录计算耗时 delta，
+        每次命中时若 now - delta * beta * ln(rand) >= 过期时间 则在后台提前刷新，
+        越接近过期、计算越慢，提前刷新的概率越高。
+
+        Args:
+            ttl: 缓存新鲜期（秒）
+            key: 缓存键模板（用函数参数格式化）或生成缓存键的函数，
+                默认根据函数名和参数生成
+            stale_ttl: 过期后仍可返回旧值的宽限期（秒）
+            beta: XFetch提前刷新系数，0表示关闭，通常取1.0
+
+        Returns:
+            装饰器函数
+        """
+
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable:
+            func_name = f"{func.__module__}.{func.__qualname__}"
+
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                cache_key = self._make_cache_key(func_name, key, args, kwargs)
+                entry = await self.get(cache_key)
+                if isinstance(entry, dict) and "fresh_until" in entry:
+                    now = time.time()
+                    if entry["fresh_until"] > now:
+                        if beta and self._should_refresh_early(entry, now, beta):
+                            self._single_flight(
+                                cache_key, func, args, kwargs, ttl, stale_ttl
+                            )
+                            cached_calls.labels(
+                                function=func_name, result="early"
+                            ).inc()
+                        else:
+                            cached_calls.labels(function=func_name, result="hit").inc()
+                        return entry["value"]
+                    if stale_ttl:
+                        # 返回旧值，后台刷新（已有刷新在进行时不重复触发）
+                        self._single_flight(
+                            cache_key, func, args, kwargs, ttl, stale_ttl
+                        )
+                        cached_calls.labels(function=func_name, result="stale").inc()
+                        return entry["value"]
+
+                result = "coalesced" if cache_key in self._inflight else "miss"
+                cached_calls.labels(function=func_name, result=result).inc()
+                task = self._single_flight(
+                    cache_key, func, args, kwargs, ttl, stale_ttl
+                )
+                # shield: 单个调用方被取消时不影响其他等待者
+                return await asyncio.shield(task)
+
+            return wrapper
+
+        return decorator
+
     async def check_connection(self) -> bool:
         """检查Redis连接状态.
 
+        连接池尚未预热时先执行预热，预热完成前不会报告就绪。
+
         Returns:
             连接是否正常
         """
         try:
-            if self._redis is None:
-                await self.connect()
+            if not self._warmed_up:
+                await self.warmup()
             await self._redis.ping()  # type: ignore
             return True
         except Exception as e:
             logger.error("Redis connection check failed", exc_info=e)
             return False
 
+    @staticmethod
+    def _make_cache_key(
+        func_name: str,
+        key: Union[str, Callable[..., str], None],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> str:
+        """生成缓存装饰器使用的缓存键.
+
+        Args:
+            func_name: 函数全名
+            key: 缓存键模板或生成函数
+            args: 位置参数
+            kwargs: 关键字参数
+
+        Returns:
+            缓存键
+        """
+        if callable(key):
+            return key(*args, **kwargs)
+        if key is not None:
+            return key.format(*args, **kwargs)
+        digest = hashlib.blake2b(
+            repr((args, sorted(kwargs.items()))).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return f"cached:{func_name}:{digest}"
+
+    @staticmethod
+    def _should_refresh_early(entry: Dict[str, Any], now: float, beta: float) -> bool:
+        """XFetch判定：是否在过期前提前刷新.
+
+        Args:
+            entry: 缓存条目，包含 fresh_until 和计算耗时 delta
+            now: 当前时间戳
+            beta: 提前刷新系数
+
+        Returns:
+            是否需要提前刷新
+        """
+        # 1 - random() 取值 (0, 1]，避免 log(0)
+        gap = -entry.get("delta", 0.0) * beta * math.log(1.0 - random.random())
+        return now + gap >= entry["fresh_until"]
+
+    def _single_flight(
+        self,
+        cache_key: str,
+        func: Callable[..., Awaitable[Any]],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        ttl: int,
+        stale_ttl: int,
+    ) -> asyncio.Task:
+        """获取或启动某个缓存键的计算任务.
+
+        Args:
+            cache_key: 缓存键
+            func: 被缓存的异步函数
+            args: 位置参数
+            kwargs: 关键字参数
+            ttl: 缓存新鲜期（秒）
+            stale_ttl: 过期宽限期（秒）
+
+        Returns:
+            计算任务
+        """
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            return task
+
+        async def _compute() -> Any:
+            start = time.perf_counter()
+            value = await func(*args, **kwargs)
+            # 新鲜期只抖动一次，宽限期紧随其后
+            fresh: float = _jitter(ttl)  # type: ignore
+            entry = {
+                "value": value,
+                "fresh_until": time.time() + fresh,
+                "delta": time.perf_counter() - start,
+            }
+            await self._store(cache_key, entry, fresh + stale_ttl)
+            return value
+
+        def _done(finished: asyncio.Task) -> None:
+            self._inflight.pop(cache_key, None)
+            # 后台刷新没有等待者，在此取出异常避免未处理警告
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(
+                    "Cached function failed",
+                    key=cache_key,
+                    exc_info=finished.exception(),
+                )
+
+        task = asyncio.create_task(_compute())
+        self._inflight[cache_key] = task
+        task.add_done_callback(_done)
+        return task
+
+    async def _unlink(self, keys: List[Any]) -> int:
+        """通过管道分批UNLINK.
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            删除的键数量
+        """
+        async with self._redis.pipeline(transaction=False) as pipe:  # type: ignore
+            for batch in self._key_batches(keys):
+                pipe.unlink(*batch)
+            return sum(await pipe.execute())
+
+    async def _publish_invalidation(
+        self, keys: List[str], prefixes: Optional[List[str]] = None
+    ) -> None:
+        """广播键失效消息，通知其他进程清理本地缓存.
+
+        Args:
+            keys: 失效的缓存键列表
+            prefixes: 失效的键前缀列表
+        """
+        message = json.dumps(
+            {"origin": self._instance_id, "keys": keys, "prefixes": prefixes or []}
+        )
+        try:
+            await self._redis.publish(  # type: ignore
+                settings.CACHE_INVALIDATION_CHANNEL, message
+            )
+        except Exception as e:
+            logger.warning(
+                "Cache invalidation publish failed", keys=len(keys), exc_info=e
+            )
+
+    @staticmethod
+    def _connection_kwargs() -> Dict[str, Any]:
+        """各部署模式通用的连接参数.
+
+        Returns:
+            连接参数
+        """
+        return {
+            "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+            "socket_connect_timeout": settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            "socket_keepalive": settings.REDIS_SOCKET_KEEPALIVE,
+            "health_check_interval": settings.REDIS_HEALTH_CHECK_INTERVAL,
+            "retry": Retry(ExponentialBackoff(), settings.REDIS_RETRIES),
+        }
+
+    def _reader(self, key: str) -> Union[Redis, RedisCluster]:
+        """选择读取某个键使用的客户端.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            键匹配 CACHE_REPLICA_READ_PREFIXES 时返回副本客户端，否则返回主客户端
+        """
+        if self._replica is not None and key.startswith(
+            tuple(settings.CACHE_REPLICA_READ_PREFIXES)
+        ):
+            return self._replica
+        return self._redis  # type: ignore
+
+    def _key_batches(self, keys: List[str]) -> Iterator[List[str]]:
+        """将键拆分为可用单条多键命令处理的批次.
+
+        集群模式下多键命令要求所有键位于同一哈希槽，因此先按槽分组。
+
+        Args:
+            keys: 缓存键列表
+
+        Yields:
+            不超过 CACHE_BATCH_SIZE 的键批次
+        """
+        if not isinstance(self._redis, RedisCluster):
+            yield from _chunks(keys, settings.CACHE_BATCH_SIZE)
+            return
+        by_slot: Dict[int, List[str]] = {}
+        for key in keys:
+            by_slot.setdefault(self._redis.keyslot(key), []).append(key)
+        for slot_keys in by_slot.values():
+            yield from _chunks(slot_keys, settings.CACHE_BATCH_SIZE)
+
+    async def _mget(
+        self, client: Union[Redis, RedisCluster], keys: List[str]
+    ) -> Dict[str, Optional[bytes]]:
+        """通过管道批量执行MGET.
+
+        Args:
+            client: 使用的客户端
+            keys: 缓存键列表
+
+        Returns:
+            键到原始字节串的映射
+        """
+        batches = list(self._key_batches(keys))
+        async with client.pipeline(transaction=False) as pipe:
+            for batch in batches:
+                pipe.mget(batch)
+            responses = await pipe.execute()
+        return {
+            key: raw
+            for batch, values in zip(batches, responses, strict=True)
+            for key, raw in zip(batch, values, strict=True)
+        }
+
+    @staticmethod
+    def _export_pool_metrics(pool: ConnectionPool) -> None:
+        """导出连接池使用情况指标.
+
+        Args:
+            pool: Redis连接池
+        """
+        redis_pool_connections.labels(state="in_use").set_function(
+            lambda: len(getattr(pool, "_in_use_connections", ()))
+        )
+        redis_pool_connections.labels(state="idle").set_function(
+            lambda: len(getattr(pool, "_available_connections", ()))
+        )
+        redis_pool_connections.labels(state="max").set(pool.max_connections)
+
+    async def _start_invalidation_listener(
+        self, client: Union[Redis, RedisCluster]
+    ) -> None:
+        """订阅失效频道（订阅会独占一个连接）.
+
+        Args:
+            client: 主客户端
+        """
+        if isinstance(client, RedisCluster):
+            # 集群中的PUBLISH会广播到所有节点，订阅任一节点即可
+            await client.initialize()
+            node = client.get_default_node()
+            self._pubsub_client = Redis(
+                host=node.host, port=node.port, **self._connection_kwargs()
+            )
+            client = self._pubsub_client
+        self._pubsub = client.pubsub(ignore_subscribe_messages=True)  # type: ignore
+        await self._pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+        self._listener = asyncio.create_task(self._listen_invalidations(self._pubsub))
+
+    async def _listen_invalidations(self, pubsub: PubSub) -> None:
+        """处理其他进程发出的失效消息.
+
+        Args:
+            pubsub: 已订阅失效频道的PubSub对象
+        """
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                payload = json.loads(message["data"])
+                if payload["origin"] == self._instance_id or self._local is None:
+                    continue
+                for key in payload["keys"]:
+                    self._local.delete(key)
+                for prefix in payload.get("prefixes", []):
+                    self._local.delete_prefix(prefix)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 订阅断开后无法保证一致性，停用本地缓存
+            logger.error(
+                "Cache invalidation listener stopped, local cache disabled",
+                exc_info=e,
+            )
+            if self._local is not None:
+                self._local.clear()
+                self._local = None
+
+
+class CacheNamespace:
+    """缓存命名空间视图，所有键自动加上命名空间前缀."""
+
+    def __init__(self, manager: CacheManager, name: str) -> None:
+        """初始化命名空间视图.
+
+        Args:
+            manager: 缓存管理器
+            name: 命名空间名称
+        """
+        self._manager = manager
+        self.name = name
+        self._prefix = f"{name}:"
+
+    def key(self, key: str) -> str:
+        """返回带命名空间前缀的完整键.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            完整缓存键
+        """
+        return self._prefix + key
+
+    async def get(self, key: str) -> Any:
+        """获取缓存值."""
+        return await self._manager.get(self.key(key))
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        """设置缓存值."""
+        await self._manager.set(self.key(key), value, expire=expire)
+
+    async def delete(self, key: str) -> None:
+        """删除缓存值."""
+        await self._manager.delete(self.key(key))
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """批量获取缓存值，返回的映射使用不带前缀的键."""
+        keys = list(keys)
+        values = await self._manager.get_many(self.key(key) for key in keys)
+        return {key: values[self.key(key)] for key in keys}
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        expire: Union[int, Dict[str, int], None] = None,
+    ) -> None:
+        """批量设置缓存值."""
+        if isinstance(expire, dict):
+            expire = {self.key(key): value for key, value in expire.items()}
+        await self._manager.set_many(
+            {self.key(key): value for key, value in items.items()}, expire=expire
+        )
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """批量删除缓存值."""
+        return await self._manager.delete_many(self.key(key) for key in keys)
+
+    async def clear(self) -> int:
+        """清除命名空间下的所有键."""
+        return await self._manager.clear_namespace(self.name)
+
 
 # 全局缓存管理器实例
 cache = CacheManager()
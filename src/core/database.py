@@ -1,20 +1,304 @@
 """数据库连接管理模块."""
 import asyncio
+import itertools
+import sys
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+from sqlalchemy import Table, event, insert, text
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.interfaces import CacheStats
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.sql.selectable import TextualSelect
+from sqlalchemy.util import LRUCache
 
 from src.config.settings import settings
+from src.core.query_cache import (
+    WRITTEN_TABLES,
+    WriteTrackingSession,
+    query_cache,
+    statement_tables,
+)
+from src.core.query_profiler import fingerprint, query_profiler
+from src.monitoring.metrics import metrics
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# 只读会话路由统计
+db_readonly_sessions = metrics.counter(
+    "db_readonly_sessions_total",
+    "Read-only sessions by target (replica/primary fallback)",
+    ["target"],
+)
+
+# 连接池指标，engine 标签为 primary 或 replica-N
+db_pool_checkout_seconds = metrics.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    ["engine"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+)
+db_pool_timeouts = metrics.counter(
+    "db_pool_timeouts_total",
+    "Database connection checkouts that timed out waiting for the pool",
+    ["engine"],
+)
+db_pool_connections = metrics.gauge(
+    "db_pool_connections",
+    "Database pool connections by state (in_use/idle/overflow/size)",
+    ["engine", "state"],
+)
+
+# 语句缓存命中统计：compiled 为SQLAlchemy编译缓存，prepared 为asyncpg预编译语句缓存
+db_statement_cache = metrics.counter(
+    "db_statement_cache_total",
+    "Statement cache lookups by cache (compiled/prepared) and result",
+    ["engine", "cache", "result"],
+)
+db_compiled_cache_entries = metrics.gauge(
+    "db_compiled_cache_entries",
+    "Entries in the SQLAlchemy compiled statement cache",
+    ["engine"],
+)
+
+# 健康检查探测耗时
+db_health_probe_seconds = metrics.histogram(
+    "db_health_probe_seconds",
+    "Database health probe latency by result",
+    ["result"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+# 批量写入行数
+db_bulk_rows = metrics.counter(
+    "db_bulk_rows_total",
+    "Rows written through bulk_insert/bulk_upsert",
+    ["operation", "method"],
+)
+
+Row = Dict[str, Any]
+Rows = Union[AsyncIterable[Row], Iterable[Row]]
+
+# 支持 ON CONFLICT/ON DUPLICATE KEY 的方言对应的 insert 构造函数
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+    "mysql": mysql.insert,
+    "mariadb": mysql.insert,
+}
+
+# 当前会话的打开位置，用于慢获取日志定位调用方
+_session_caller: ContextVar[Optional[str]] = ContextVar(
+    "db_session_caller", default=None
+)
+
+# session.info 中标记只读会话
+READONLY_SESSION = "db_readonly_session"
+
+# 只读会话中禁止执行的文本SQL语句类型
+_WRITE_OPERATIONS = frozenset(
+    {
+        "INSERT",
+        "UPDATE",
+        "DELETE",
+        "MERGE",
+        "REPLACE",
+        "UPSERT",
+        "CREATE",
+        "ALTER",
+        "DROP",
+        "TRUNCATE",
+        "GRANT",
+        "REVOKE",
+    }
+)
+
+# 各方言查询复制延迟（秒）的语句，未列出的方言不检查延迟
+_REPLICA_LAG_QUERIES = {
+    "postgresql": (
+        "SELECT COALESCE(EXTRACT(EPOCH FROM "
+        "now() - pg_last_xact_replay_timestamp()), 0)"
+    ),
+}
+
+
+def _caller_location() -> str:
+    """返回本模块和contextlib之外最近一层调用方的代码位置.
+
+    Returns:
+        "文件:行号 in 函数" 形式的位置
+    """
+    skip = (__file__, "contextlib.py")
+    frame = sys._getframe(1)
+    while frame.f_back is not None and frame.f_code.co_filename.endswith(skip):
+        frame = frame.f_back
+    code = frame.f_code
+    return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+
+
+class ReadOnlySessionError(sa_exc.InvalidRequestError):
+    """在只读会话中尝试写入."""
+
+
+@event.listens_for(WriteTrackingSession, "before_flush")
+def _reject_readonly_flush(
+    session: Session, flush_context: Any, instances: Any
+) -> None:
+    """只读会话中存在待写入的ORM对象时拒绝刷新."""
+    if session.info.get(READONLY_SESSION) and (
+        session.new or session.dirty or session.deleted
+    ):
+        raise ReadOnlySessionError("Cannot flush changes in a read-only session")
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _reject_readonly_execute(state: ORMExecuteState) -> None:
+    """只读会话中拒绝执行写入语句.
+
+    只读会话使用 AUTOCOMMIT 连接，写入会立即生效且无法回滚，因此在发送前拦截。
+    通过 session.connection() 直接执行的语句不经过此检查。
+    """
+    if not state.session.info.get(READONLY_SESSION):
+        return
+    if state.is_insert or state.is_update or state.is_delete:
+        write = True
+    elif state.is_select and not isinstance(state.statement, TextualSelect):
+        # ORM查询无需编译成SQL再判断，这是最常见的情况
+        return
+    else:
+        # text() 等原始SQL无法从语句类型判断，按指纹中的操作类型检查
+        write = fingerprint(str(state.statement))[0] in _WRITE_OPERATIONS
+    if write:
+        raise ReadOnlySessionError("Cannot execute a write in a read-only session")
+
+
+class _PreparedStatementCache(LRUCache):
+    """统计命中次数的asyncpg预编译语句缓存."""
+
+    __slots__ = ("_engine_name",)
+
+    def __init__(self, capacity: int, engine_name: str) -> None:
+        """初始化缓存.
+
+        Args:
+            capacity: 缓存容量
+            engine_name: 引擎名称，用作指标标签
+        """
+        super().__init__(capacity)
+        self._engine_name = engine_name
+
+    def __contains__(self, key: object) -> bool:
+        """asyncpg适配层在取用语句前先检查是否存在，在此计数."""
+        found = key in self._data
+        db_statement_cache.labels(
+            engine=self._engine_name,
+            cache="prepared",
+            result="hit" if found else "miss",
+        ).inc()
+        return found
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """记录连接获取等待时间和超时次数的连接池.
+
+    连接池事件只在获取成功后触发，无法覆盖排队等待和超时，
+    因此在获取连接的入口处计时。
+    """
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        """从连接池获取连接并记录等待时间."""
+        name = self.logging_name or "primary"
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except sa_exc.TimeoutError:
+            db_pool_timeouts.labels(engine=name).inc()
+            logger.warning(
+                "Database pool checkout timed out",
+                engine=name,
+                caller=_session_caller.get(),
+            )
+            raise
+        elapsed = time.perf_counter() - start
+        db_pool_checkout_seconds.labels(engine=name).observe(elapsed)
+        threshold = settings.DB_SLOW_CHECKOUT_THRESHOLD
+        if threshold > 0 and elapsed >= threshold:
+            logger.warning(
+                "Slow database pool checkout",
+                engine=name,
+                wait=elapsed,
+                caller=_session_caller.get(),
+            )
+        return record
+
+
+async def _chunked(rows: Rows, size: int) -> AsyncGenerator[List[Row], None]:
+    """将同步或异步的行迭代器按固定大小分块.
+
+    Args:
+        rows: 行迭代器
+        size: 每块行数
+
+    Yields:
+        行列表
+    """
+    chunk: List[Row] = []
+    if isinstance(rows, AsyncIterable):
+        async for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    else:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class BulkResult:
+    """批量写入结果."""
+
+    rows: int
+    chunks: int
+    elapsed: float
+    method: str
+
+    @property
+    def rows_per_sec(self) -> float:
+        """每秒写入行数."""
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
 
 class DatabaseManager:
     """数据库管理器."""
@@ -23,71 +307,688 @@ class DatabaseManager:
         """初始化数据库管理器."""
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[sessionmaker] = None
+        self._replicas: List[AsyncEngine] = []
+        self._replica_cursor = itertools.count()
+        # 副本 -> (上次检查时间, 复制延迟)
+        self._replica_lag: Dict[AsyncEngine, Tuple[float, float]] = {}
+        # (上次探测时间, 探测结果)
+        self._health: Optional[Tuple[float, bool]] = None
+        self._health_lock = asyncio.Lock()
+        # 引擎 -> 使用 AUTOCOMMIT 隔离级别的同池引擎
+        self._autocommit_engines: Dict[AsyncEngine, AsyncEngine] = {}
 
     async def connect(self) -> None:
         """建立数据库连接."""
         if self._engine is not None:
             return
 
-        self._engine = create_async_engine(
-            settings.DATABASE_URL,
-            echo=settings.SQL_DEBUG,
-            pool_size=settings.DB_POOL_SIZE,
-            max_overflow=settings.DB_MAX_OVERFLOW,
-        )
+        self._engine = self._create_engine(settings.DATABASE_URL, "primary")
+        self._replicas = [
+            self._create_engine(url, f"replica-{i}")
+            for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+        ]
 
         self._session_factory = sessionmaker(
             self._engine,
             class_=AsyncSession,
+            sync_session_class=WriteTrackingSession,
             expire_on_commit=False,
         )
 
-        logger.info("Database connection established")
+        logger.info("Database connection established", replicas=len(self._replicas))
 
     async def disconnect(self) -> None:
         """关闭数据库连接."""
         if self._engine is None:
             return
 
+        for replica in self._replicas:
+            await replica.dispose()
+        self._replicas = []
+        self._replica_lag.clear()
+        self._autocommit_engines.clear()
+        self._health = None
         await self._engine.dispose()
         self._engine = None
+        if settings.DB_QUERY_STATS_FILE:
+            query_profiler.dump(settings.DB_QUERY_STATS_FILE)
         self._session_factory = None
         logger.info("Database connection closed")
 
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session(
+        self, readonly: bool = False, autocommit: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
         """创建数据库会话.
 
+        默认模式在同一个事务中执行，正常退出时提交，异常时回滚。
+        只读和自动提交模式的连接使用 AUTOCOMMIT 隔离级别，不发送 BEGIN，
+        退出时也不再提交，每条语句少一次事务往返。
+
+        Args:
+            readonly: 是否为只读会话，只读会话优先路由到只读副本，
+                没有可用副本时回退到主库，会话内写入会抛出 ReadOnlySessionError
+            autocommit: 是否为自动提交会话，每条语句立即生效，异常时无法回滚
+
         Yields:
             数据库会话
         """
         if self._session_factory is None:
             await self.connect()
 
-        async with self._session_factory() as session:  # type: ignore
+        # 会话结束后恢复，避免之后的语句报告本会话的调用位置
+        token = (
+            _session_caller.set(_caller_location())
+            if settings.DB_SLOW_CHECKOUT_THRESHOLD > 0
+            else None
+        )
+        try:
+            async with self._open_session(readonly, autocommit) as session:
+                yield session
+        finally:
+            if token is not None:
+                _session_caller.reset(token)
+
+    @asynccontextmanager
+    async def _open_session(
+        self, readonly: bool, autocommit: bool
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """按会话模式创建会话并在退出时提交或回滚.
+
+        Args:
+            readonly: 是否为只读会话
+            autocommit: 是否为自动提交会话
+
+        Yields:
+            数据库会话
+        """
+        bind = await self._bind(readonly)
+        if not (readonly or autocommit):
+            async with self._session_factory(bind=bind) as session:  # type: ignore
+                try:
+                    yield session
+                    await session.commit()
+                except Exception:
+                    await session.rollback()
+                    raise
+                await query_cache.invalidate(session.info.pop(WRITTEN_TABLES, ()))
+            return
+
+        bind = self._autocommit_engine(bind)
+        async with self._session_factory(bind=bind) as session:  # type: ignore
+            if readonly:
+                session.info[READONLY_SESSION] = True
             try:
                 yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
+                if autocommit and not readonly:
+                    # 将未刷新的ORM对象写入数据库，AUTOCOMMIT 下无需再提交
+                    await session.flush()
+            finally:
+                # 自动提交模式下已执行的写入即使随后出错也已生效
+                await query_cache.invalidate(session.info.pop(WRITTEN_TABLES, ()))
+
+    async def query_cached(
+        self,
+        query: Any,
+        params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[int] = None,
+        tables: Optional[Iterable[str]] = None,
+        readonly: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """执行查询并缓存结果.
+
+        适用于变化缓慢的参考数据。通过 session() 提交的写入会使涉及同一张表的
+        缓存失效；文本SQL或绕过会话的写入需要显式指定 tables 并自行调用
+        query_cache.invalidate()。
+
+        Args:
+            query: SQL字符串或可执行语句
+            params: 绑定参数
+            ttl: 缓存时间（秒），默认为 DB_RESULT_CACHE_TTL
+            tables: 用于失效的表名，默认从语句中提取
+            readonly: 未命中时是否路由到只读副本。副本可能滞后于刚提交的写入，
+                读到的旧数据会以新的表版本号缓存到过期，默认从主库读取
+
+        Returns:
+            字典形式的结果行
+        """
+        if self._session_factory is None:
+            await self.connect()
+
+        stmt = text(query) if isinstance(query, str) else query
+        bind = await self._bind(readonly)
+        key = query_cache.key(stmt, params, bind.dialect)
+        tables = statement_tables(stmt) if tables is None else tables
+        rows, full_key = await query_cache.get(key, tables)
+        if rows is not None:
+            return rows
+
+        async with self._autocommit_engine(bind).connect() as conn:
+            result = await conn.execute(stmt, params)
+            rows = [dict(row) for row in result.mappings()]
+        await query_cache.set(full_key, rows, ttl or settings.DB_RESULT_CACHE_TTL)
+        return rows
+
+    @staticmethod
+    @asynccontextmanager
+    async def nested(session: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+        """在会话事务内开启保存点.
+
+        块内异常只回滚到保存点并继续抛出，捕获后外层事务仍可继续使用::
+
+            async with db.session() as session:
+                try:
+                    async with db.nested(session):
+                        session.add(item)
+                except IntegrityError:
+                    ...  # 仅 item 被回滚
+
+        Args:
+            session: 默认模式的数据库会话
+
+        Yields:
+            同一个数据库会话
+        """
+        async with session.begin_nested():
+            yield session
+
+    async def stream(
+        self,
+        query: Any,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        mapping: Optional[str] = None,
+        readonly: bool = True,
+    ) -> AsyncGenerator[Any, None]:
+        """使用服务端游标流式读取查询结果.
+
+        每次只从数据库取 batch_size 行，内存占用与结果集大小无关。
+        指定 mapping 时直接在连接上执行，不经过ORM会话和标识映射。
+
+        Args:
+            query: SQL字符串或可执行语句
+            params: 绑定参数
+            batch_size: 每批读取的行数，默认为 DB_STREAM_BATCH_SIZE
+            mapping: 结果映射方式，tuple 或 dict，None 表示返回ORM结果行
+            readonly: 是否路由到只读副本
+
+        Yields:
+            结果行
+        """
+        if mapping not in (None, "tuple", "dict"):
+            raise ValueError(f"Unsupported stream mapping: {mapping}")
+        if self._session_factory is None:
+            await self.connect()
+
+        stmt = text(query) if isinstance(query, str) else query
+        options = self._stream_options(batch_size)
+        bind = await self._bind(readonly)
+
+        if mapping is None:
+            async with self._session_factory(bind=bind) as session:  # type: ignore
+                result = await session.stream(stmt, params, execution_options=options)
+                async for row in self._iter_batches(result, mapping):
+                    yield row
+            return
+
+        async with bind.connect() as conn:
+            result = await conn.stream(stmt, params, execution_options=options)
+            async for row in self._iter_batches(result, mapping):
+                yield row
+
+    @staticmethod
+    def _stream_options(batch_size: Optional[int]) -> Dict[str, Any]:
+        """返回服务端游标的执行选项.
 
-    async def check_connection(self) -> bool:
+        Args:
+            batch_size: 每批读取的行数，默认为 DB_STREAM_BATCH_SIZE
+
+        Returns:
+            执行选项
+        """
+        return {
+            "stream_results": True,
+            "yield_per": batch_size or settings.DB_STREAM_BATCH_SIZE,
+        }
+
+    @staticmethod
+    async def _iter_batches(
+        result: Any, mapping: Optional[str]
+    ) -> AsyncGenerator[Any, None]:
+        """按 yield_per 分批取出结果并逐行转换.
+
+        Args:
+            result: 流式结果
+            mapping: 结果映射方式，tuple、dict 或 None
+
+        Yields:
+            结果行
+        """
+        if mapping == "dict":
+            partitions = result.mappings().partitions()
+            convert: Callable[[Any], Any] = dict
+        else:
+            partitions = result.partitions()
+            convert = tuple if mapping == "tuple" else (lambda row: row)
+        async for partition in partitions:
+            for row in partition:
+                yield convert(row)
+
+    async def bulk_insert(
+        self, table: Any, rows: Rows, chunk_size: Optional[int] = None
+    ) -> BulkResult:
+        """批量插入数据.
+
+        按块写入，内存占用只与块大小有关。PostgreSQL(asyncpg) 使用 COPY，
+        其他方言使用 executemany。所有块在同一个事务中提交。
+
+        Args:
+            table: 表对象或ORM模型
+            rows: 字典形式的行，支持同步或异步迭代器
+            chunk_size: 每块行数，默认为 DB_BULK_CHUNK_SIZE
+
+        Returns:
+            写入结果
+        """
+        table = self._table(table)
+        engine = await self._primary()
+        use_copy = engine.dialect.name == "postgresql" and (
+            engine.dialect.driver == "asyncpg"
+        )
+        method = "copy" if use_copy else "executemany"
+
+        async def write(conn: AsyncConnection, chunk: List[Row]) -> None:
+            if use_copy:
+                await self._copy_chunk(conn, table, chunk)
+            else:
+                await conn.execute(insert(table), chunk)
+
+        result = await self._bulk_write(
+            "insert", method, rows, chunk_size, engine, write
+        )
+        await query_cache.invalidate([table.name])
+        return result
+
+    async def bulk_upsert(
+        self,
+        table: Any,
+        rows: Rows,
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> BulkResult:
+        """批量插入或更新数据.
+
+        使用方言的 ON CONFLICT DO UPDATE（MySQL 为 ON DUPLICATE KEY UPDATE）
+        按块执行 executemany，所有块在同一个事务中提交。
+
+        Args:
+            table: 表对象或ORM模型
+            rows: 字典形式的行，支持同步或异步迭代器
+            conflict_columns: 判断冲突的唯一键列（MySQL 按表上的唯一索引判断）
+            update_columns: 冲突时更新的列，默认为除冲突列外的所有列
+            chunk_size: 每块行数，默认为 DB_BULK_CHUNK_SIZE
+
+        Returns:
+            写入结果
+        """
+        table = self._table(table)
+        engine = await self._primary()
+        dialect_insert = _UPSERT_DIALECTS.get(engine.dialect.name)
+        if dialect_insert is None:
+            raise ValueError(
+                f"Unsupported dialect for bulk upsert: {engine.dialect.name}"
+            )
+
+        if update_columns is None:
+            update_columns = [
+                column.name
+                for column in table.columns
+                if column.name not in conflict_columns
+            ]
+        stmt = dialect_insert(table)
+        if engine.dialect.name in ("mysql", "mariadb"):
+            stmt = stmt.on_duplicate_key_update(
+                {name: stmt.inserted[name] for name in update_columns}
+            )
+        elif update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+        async def write(conn: AsyncConnection, chunk: List[Row]) -> None:
+            await conn.execute(stmt, chunk)
+
+        result = await self._bulk_write(
+            "upsert", "executemany", rows, chunk_size, engine, write
+        )
+        await query_cache.invalidate([table.name])
+        return result
+
+    async def check_connection(self, force: bool = False) -> bool:
         """检查数据库连接状态.
 
+        探测结果缓存 DB_HEALTH_CHECK_INTERVAL 秒，并发调用共享同一次探测，
+        高频的就绪检查不会占用额外的连接。
+
+        Args:
+            force: 是否忽略缓存立即探测
+
         Returns:
             连接是否正常
         """
-        try:
-            if self._engine is None:
-                await self.connect()
+        if not force and self._health_fresh():
+            return self._health[1]  # type: ignore
 
-            async with self._engine.connect() as conn:  # type: ignore
-                await conn.execute("SELECT 1")
-            return True
+        async with self._health_lock:
+            # 等待锁期间其他调用可能已完成探测
+            if force or not self._health_fresh():
+                self._health = (time.monotonic(), await self._probe())
+        return self._health[1]  # type: ignore
+
+    async def _bind(self, readonly: bool) -> AsyncEngine:
+        """选择会话绑定的引擎，只读请求优先使用只读副本.
+
+        Args:
+            readonly: 是否为只读请求
+
+        Returns:
+            目标引擎
+        """
+        if not (readonly and self._replicas):
+            return self._engine  # type: ignore
+        replica = await self._select_replica()
+        db_readonly_sessions.labels(
+            target="replica" if replica is not None else "primary"
+        ).inc()
+        return replica or self._engine  # type: ignore
+
+    def _health_fresh(self) -> bool:
+        """缓存的探测结果是否仍在有效期内."""
+        return self._health is not None and (
+            time.monotonic() - self._health[0] < settings.DB_HEALTH_CHECK_INTERVAL
+        )
+
+    async def _probe(self) -> bool:
+        """在 DB_HEALTH_CHECK_TIMEOUT 内执行 SELECT 1.
+
+        超时同时覆盖等待连接池和执行语句的时间。
+
+        Returns:
+            连接是否正常
+        """
+
+        async def ping() -> None:
+            engine = await self._primary()
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(ping(), timeout=settings.DB_HEALTH_CHECK_TIMEOUT)
+            result = True
         except Exception as e:
             logger.error("Database connection check failed", exc_info=e)
-            return False
+            result = False
+        db_health_probe_seconds.labels(result="ok" if result else "error").observe(
+            time.perf_counter() - start
+        )
+        return result
+
+    def _autocommit_engine(self, engine: AsyncEngine) -> AsyncEngine:
+        """返回与指定引擎共享连接池的 AUTOCOMMIT 引擎.
+
+        Args:
+            engine: 原始引擎
+
+        Returns:
+            使用 AUTOCOMMIT 隔离级别的引擎
+        """
+        autocommit = self._autocommit_engines.get(engine)
+        if autocommit is None:
+            autocommit = engine.execution_options(isolation_level="AUTOCOMMIT")
+            self._autocommit_engines[engine] = autocommit
+        return autocommit
+
+    async def _primary(self) -> AsyncEngine:
+        """返回主库引擎，未连接时先建立连接."""
+        if self._engine is None:
+            await self.connect()
+        return self._engine  # type: ignore
+
+    @staticmethod
+    def _table(table: Any) -> Table:
+        """将ORM模型转换为表对象."""
+        return getattr(table, "__table__", table)
+
+    @staticmethod
+    async def _bulk_write(
+        operation: str,
+        method: str,
+        rows: Rows,
+        chunk_size: Optional[int],
+        engine: AsyncEngine,
+        write: Callable[[AsyncConnection, List[Row]], Awaitable[None]],
+    ) -> BulkResult:
+        """在单个事务中逐块写入并统计吞吐量.
+
+        Args:
+            operation: 操作名称，用于日志和指标
+            method: 写入方式，用于日志和指标
+            rows: 行迭代器
+            chunk_size: 每块行数
+            engine: 目标引擎
+            write: 写入单个块的协程函数
+
+        Returns:
+            写入结果
+        """
+        total = chunks = 0
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            async for chunk in _chunked(
+                rows, chunk_size or settings.DB_BULK_CHUNK_SIZE
+            ):
+                await write(conn, chunk)
+                total += len(chunk)
+                chunks += 1
+                db_bulk_rows.labels(operation=operation, method=method).inc(len(chunk))
+
+        result = BulkResult(total, chunks, time.perf_counter() - start, method)
+        logger.info(
+            f"Bulk {operation} finished",
+            rows=result.rows,
+            chunks=result.chunks,
+            method=method,
+            elapsed=round(result.elapsed, 3),
+            rows_per_sec=round(result.rows_per_sec, 1),
+        )
+        return result
+
+    @staticmethod
+    async def _copy_chunk(
+        conn: AsyncConnection, table: Table, chunk: List[Row]
+    ) -> None:
+        """通过 asyncpg 的 COPY 协议写入一个块.
+
+        Args:
+            conn: 已开启事务的连接
+            table: 目标表
+            chunk: 行列表
+        """
+        columns = list(chunk[0])
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(  # type: ignore
+            table.name,
+            schema_name=table.schema,
+            columns=columns,
+            records=[tuple(row[name] for name in columns) for row in chunk],
+        )
+
+    @staticmethod
+    def _create_engine(url: str, name: str) -> AsyncEngine:
+        """按统一的连接池配置创建引擎并导出连接池指标.
+
+        Args:
+            url: 数据库连接URL
+            name: 引擎名称，用作指标标签
+
+        Returns:
+            异步引擎
+        """
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            connect_args["prepared_statement_cache_size"] = (
+                settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+            )
+        pool_class = settings.DB_POOL_CLASS
+        if pool_class == "null":
+            # 每次使用都新建连接，适合不保留进程状态的serverless环境
+            pool_args: Dict[str, Any] = {"poolclass": NullPool}
+        elif pool_class == "queue":
+            pool_args = {
+                "poolclass": InstrumentedQueuePool,
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_use_lifo": settings.DB_POOL_USE_LIFO,
+            }
+        else:
+            raise ValueError(f"Unsupported DB_POOL_CLASS: {pool_class}")
+
+        engine = create_async_engine(
+            url,
+            echo=settings.SQL_DEBUG,
+            pool_logging_name=name,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+            connect_args=connect_args,
+            **pool_args,
+        )
+        sync_engine = engine.sync_engine
+        if pool_class == "queue":
+            # dispose() 会替换连接池对象，因此每次采集时重新读取 engine.pool
+            states = {
+                "in_use": lambda: sync_engine.pool.checkedout(),
+                "idle": lambda: sync_engine.pool.checkedin(),
+                "overflow": lambda: max(0, sync_engine.pool.overflow()),
+                "size": lambda: sync_engine.pool.size(),
+            }
+            for state, value in states.items():
+                db_pool_connections.labels(engine=name, state=state).set_function(value)
+        db_compiled_cache_entries.labels(engine=name).set_function(
+            lambda: len(sync_engine._compiled_cache or ())
+        )
+        DatabaseManager._instrument_statement_caches(sync_engine, name)
+        if settings.DB_PROFILE_QUERIES:
+            query_profiler.attach(sync_engine)
+        return engine
+
+    @staticmethod
+    def _instrument_statement_caches(sync_engine: Any, name: str) -> None:
+        """注册编译缓存和预编译语句缓存的命中统计.
+
+        Args:
+            sync_engine: 同步引擎
+            name: 引擎名称，用作指标标签
+        """
+        compiled = {
+            CacheStats.CACHE_HIT: db_statement_cache.labels(
+                engine=name, cache="compiled", result="hit"
+            ),
+            CacheStats.CACHE_MISS: db_statement_cache.labels(
+                engine=name, cache="compiled", result="miss"
+            ),
+        }
+
+        def on_execute(
+            conn: Any,
+            cursor: Any,
+            statement: str,
+            parameters: Any,
+            context: Any,
+            executemany: bool,
+        ) -> None:
+            # 纯文本SQL和禁用缓存的语句不计入
+            counter = compiled.get(getattr(context, "cache_hit", None))
+            if counter is not None:
+                counter.inc()
+
+        def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            # 仅asyncpg适配层带有预编译语句缓存
+            cache = getattr(dbapi_connection, "_prepared_statement_cache", None)
+            if cache is not None:
+                dbapi_connection._prepared_statement_cache = _PreparedStatementCache(
+                    cache.capacity, name
+                )
+
+        event.listen(sync_engine, "before_cursor_execute", on_execute)
+        event.listen(sync_engine, "connect", on_connect)
+
+    async def _select_replica(self) -> Optional[AsyncEngine]:
+        """按 DB_REPLICA_STRATEGY 选择可用的只读副本.
+
+        Returns:
+            只读副本引擎，全部不可用时返回None
+        """
+        if settings.DB_REPLICA_STRATEGY == "least_connections":
+            candidates = sorted(
+                self._replicas,
+                # NullPool 不保留连接，视为0
+                key=lambda engine: getattr(
+                    engine.sync_engine.pool, "checkedout", lambda: 0
+                )(),
+            )
+        else:
+            start = next(self._replica_cursor) % len(self._replicas)
+            candidates = self._replicas[start:] + self._replicas[:start]
+
+        for replica in candidates:
+            if await self._replica_within_lag(replica):
+                return replica
+        return None
+
+    async def _replica_within_lag(self, replica: AsyncEngine) -> bool:
+        """检查副本复制延迟是否在 DB_REPLICA_MAX_LAG 以内.
+
+        检查结果缓存 DB_REPLICA_LAG_CHECK_INTERVAL 秒，检查失败视为不可用。
+
+        Args:
+            replica: 只读副本引擎
+
+        Returns:
+            副本是否可用
+        """
+        query = _REPLICA_LAG_QUERIES.get(replica.dialect.name)
+        if settings.DB_REPLICA_MAX_LAG <= 0 or query is None:
+            return True
+
+        now = time.monotonic()
+        checked_at, lag = self._replica_lag.get(replica, (0.0, 0.0))
+        if replica not in self._replica_lag or (
+            now - checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL
+        ):
+            try:
+                async with replica.connect() as conn:
+                    lag = float((await conn.execute(text(query))).scalar() or 0.0)
+            except Exception as e:
+                logger.warning(
+                    "Replica lag check failed", replica=str(replica.url), exc_info=e
+                )
+                lag = float("inf")
+            self._replica_lag[replica] = (now, lag)
+            if lag > settings.DB_REPLICA_MAX_LAG:
+                logger.warning(
+                    "Replica lagging, routing reads elsewhere",
+                    replica=str(replica.url),
+                    lag=lag,
+                )
+
+        return lag <= settings.DB_REPLICA_MAX_LAG
 
 
 # 全局数据库管理器实例
@@ -0,0 +1,62 @@
+"""进程内Redis替身.
+
+基于 fakeredis 提供与 redis.asyncio 相同的API，并可为每次网络往返注入固定延迟，
+用于在没有真实Redis的CI环境中测试和压测缓存层。
+"""
+import asyncio
+from typing import Any, Optional
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
+try:
+    from fakeredis import FakeAsyncRedis, FakeAsyncRedisConnection, FakeServer
+except ImportError:  # pragma: no cover
+    FakeAsyncRedis = FakeAsyncRedisConnection = FakeServer = None
+
+# 同一进程内的所有客户端共享一个服务端，发布/订阅可以互通
+_server: Optional[Any] = None
+
+
+def create_fake_redis(
+    latency: float = 0.0,
+    max_connections: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> Redis:
+    """创建进程内Redis客户端.
+
+    与单机模式一样使用阻塞式连接池，连接耗尽时的排队行为和真实部署一致。
+
+    Args:
+        latency: 每次发送命令（管道整体算一次）前注入的延迟（秒）
+        max_connections: 连接池最大连接数
+        timeout: 等待空闲连接的超时时间（秒）
+
+    Returns:
+        与 redis.asyncio.Redis 接口一致的客户端
+    """
+    if FakeAsyncRedis is None:
+        raise RuntimeError("fake Redis backend requires the 'fakeredis' package")
+
+    global _server
+    if _server is None:
+        _server = FakeServer()
+
+    class LatencyConnection(FakeAsyncRedisConnection):  # type: ignore
+        """发送命令前模拟网络往返延迟的连接."""
+
+        async def send_packed_command(self, *args: Any, **kwargs: Any) -> None:
+            """发送已打包的命令."""
+            if latency:
+                await asyncio.sleep(latency)
+            await super().send_packed_command(*args, **kwargs)
+
+    client = FakeAsyncRedis(
+        server=_server,
+        connection_class=LatencyConnection,
+        connection_pool_class=BlockingConnectionPool,
+        max_connections=max_connections,
+    )
+    # FakeAsyncRedis 不转发连接池的等待超时参数
+    if timeout is not None:
+        client.connection_pool.timeout = timeout
+    return client
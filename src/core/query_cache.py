@@ -0,0 +1,238 @@
+"""数据库查询结果缓存模块.
+
+以编译后的SQL语句和绑定参数作为缓存键，结果存放在进程内缓存或Redis中。
+每个缓存条目带有所涉及表的版本号，会话提交写入后更新这些表的版本号，
+旧条目随之失效并在过期后自然淘汰。Redis后端使用pickle编码结果行，
+datetime、Decimal、UUID、bytes 等列值读回后类型不变。
+"""
+import hashlib
+import itertools
+import json
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql.util import find_tables
+
+from src.config.settings import settings
+from src.core.cache import _MISSING, LocalCache, cache
+from src.core.serialization import Serializer
+from src.monitoring.metrics import metrics
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 查询缓存命中统计
+db_query_cache_requests = metrics.counter(
+    "db_query_cache_requests_total",
+    "Query result cache lookups by result (hit/miss)",
+    ["result"],
+)
+db_query_cache_invalidations = metrics.counter(
+    "db_query_cache_invalidations_total",
+    "Query result cache table invalidations",
+    ["table"],
+)
+
+# session.info 中记录本会话写入过的表名
+WRITTEN_TABLES = "query_cache_written_tables"
+
+
+class WriteTrackingSession(Session):
+    """记录写入表名的会话，提交后据此使查询缓存失效."""
+
+
+@event.listens_for(WriteTrackingSession, "after_flush")
+def _track_flush(session: Session, flush_context: Any) -> None:
+    """记录ORM对象刷新时写入的表."""
+    tables = session.info.setdefault(WRITTEN_TABLES, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        tables.update(table.name for table in inspect(obj).mapper.tables)
+
+
+@event.listens_for(WriteTrackingSession, "do_orm_execute")
+def _track_execute(state: ORMExecuteState) -> None:
+    """记录通过 session.execute 执行的 INSERT/UPDATE/DELETE 写入的表.
+
+    文本SQL无法识别目标表，需要调用方自行使缓存失效。
+    """
+    if state.is_insert or state.is_update or state.is_delete:
+        name = getattr(getattr(state.statement, "table", None), "name", None)
+        if name:
+            state.session.info.setdefault(WRITTEN_TABLES, set()).add(name)
+
+
+def statement_tables(stmt: Any) -> Set[str]:
+    """提取语句引用的表名.
+
+    Args:
+        stmt: 可执行语句
+
+    Returns:
+        表名集合，文本SQL返回空集合
+    """
+    return {
+        table.name
+        for table in find_tables(stmt, include_joins=True, include_aliases=True)
+        if getattr(table, "name", None)
+    }
+
+
+class QueryCache:
+    """查询结果缓存."""
+
+    def __init__(self) -> None:
+        """初始化查询缓存."""
+        self._local: Optional[LocalCache] = None
+        # 进程内后端的表版本号
+        self._versions: Dict[str, str] = {}
+        # (方言, 语句缓存键) -> 编译结果，避免每次查询都重新编译
+        self._compiled: "OrderedDict[Tuple[str, Any], Any]" = OrderedDict()
+        # 结果行包含JSON无法表示的类型，不使用缓存管理器的编解码器
+        self._serializer = Serializer(
+            "pickle",
+            settings.CACHE_COMPRESSION,
+            settings.CACHE_COMPRESSION_THRESHOLD,
+        )
+
+    @property
+    def _redis(self) -> bool:
+        """是否使用Redis后端."""
+        return settings.DB_RESULT_CACHE_BACKEND == "redis"
+
+    def key(self, stmt: Any, params: Optional[Dict[str, Any]], dialect: Any) -> str:
+        """计算语句和参数对应的缓存键.
+
+        Args:
+            stmt: 可执行语句
+            params: 绑定参数
+            dialect: 目标方言
+
+        Returns:
+            缓存键摘要
+        """
+        # 与SQLAlchemy编译缓存相同，按语句结构复用编译结果再代入本次的参数值
+        cache_key = stmt._generate_cache_key()
+        compiled = None
+        if cache_key is not None:
+            lookup = (dialect.name, cache_key.key)
+            compiled = self._compiled.get(lookup)
+        if compiled is None:
+            compiled = stmt.compile(dialect=dialect, cache_key=cache_key)
+            if cache_key is not None:
+                self._compiled[lookup] = compiled
+                while len(self._compiled) > settings.DB_RESULT_CACHE_MAX_SIZE:
+                    self._compiled.popitem(last=False)
+
+        bound = compiled.construct_params(
+            params,
+            extracted_parameters=cache_key.bindparams if cache_key else None,
+        )
+        raw = json.dumps(
+            [dialect.name, str(compiled), bound], sort_keys=True, default=str
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()  # nosec B324
+
+    async def get(
+        self, key: str, tables: Iterable[str]
+    ) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+        """读取缓存结果.
+
+        Args:
+            key: 缓存键摘要
+            tables: 查询涉及的表名
+
+        Returns:
+            (缓存结果，未命中时为None; 带表版本号的完整缓存键)
+        """
+        full_key = f"{key}:{await self._version_suffix(sorted(tables))}"
+        if self._redis:
+            client = await cache.client()
+            value = self._serializer.loads(await client.get(self._result_key(full_key)))
+        else:
+            # 进程内后端同样保存序列化结果，调用方修改返回的行不会影响缓存
+            payload = self._local_cache().get(full_key)
+            value = None if payload is _MISSING else self._serializer.loads(payload)
+        db_query_cache_requests.labels(result="miss" if value is None else "hit").inc()
+        return value, full_key
+
+    async def set(self, full_key: str, rows: List[Dict[str, Any]], ttl: int) -> None:
+        """写入缓存结果.
+
+        Args:
+            full_key: get() 返回的完整缓存键
+            rows: 查询结果
+            ttl: 过期时间（秒）
+        """
+        if self._redis:
+            client = await cache.client()
+            await client.set(
+                self._result_key(full_key), self._serializer.dumps(rows), ex=ttl
+            )
+        else:
+            self._local_cache().set(full_key, self._serializer.dumps(rows), ttl)
+
+    async def invalidate(self, tables: Iterable[str]) -> None:
+        """使涉及指定表的缓存结果失效.
+
+        Args:
+            tables: 表名
+        """
+        tables = set(tables)
+        if not tables:
+            return
+        for table in tables:
+            db_query_cache_invalidations.labels(table=table).inc()
+        if self._redis:
+            await cache.namespace("query").set_many(
+                {f"v:{table}": uuid.uuid4().hex for table in tables}
+            )
+        else:
+            for table in tables:
+                self._versions[table] = uuid.uuid4().hex
+        logger.debug("Query cache invalidated", tables=sorted(tables))
+
+    @staticmethod
+    def _result_key(full_key: str) -> str:
+        """返回结果行在Redis中的键.
+
+        Args:
+            full_key: 带表版本号的完整缓存键
+
+        Returns:
+            Redis键
+        """
+        return cache.namespace("query").key(f"r:{full_key}")
+
+    def _local_cache(self) -> LocalCache:
+        """返回进程内后端，首次使用时创建."""
+        if self._local is None:
+            # 过期时间由每次写入时指定
+            self._local = LocalCache(settings.DB_RESULT_CACHE_MAX_SIZE, float("inf"))
+        return self._local
+
+    async def _version_suffix(self, tables: List[str]) -> str:
+        """返回表版本号组成的键后缀.
+
+        Args:
+            tables: 排序后的表名
+
+        Returns:
+            键后缀
+        """
+        if not tables:
+            return ""
+        if self._redis:
+            versions = await cache.namespace("query").get_many(
+                f"v:{table}" for table in tables
+            )
+            return ".".join(
+                f"{table}={versions[f'v:{table}'] or 0}" for table in tables
+            )
+        return ".".join(f"{table}={self._versions.get(table, 0)}" for table in tables)
+
+
+# 全局查询缓存实例
+query_cache = QueryCache()
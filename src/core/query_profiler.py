@@ -0,0 +1,266 @@
+"""SQL语句性能分析模块.
+
+通过引擎的 before/after_cursor_execute 事件为每条语句计时，按规范化后的SQL指纹
+汇总耗时并导出直方图，超过阈值的慢查询输出结构化日志。
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config.settings import settings
+from src.monitoring.metrics import metrics
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 语句耗时，超出 DB_QUERY_FINGERPRINT_LIMIT 的指纹归入 other，保证标签数量有界
+db_query_seconds = metrics.histogram(
+    "db_query_seconds",
+    "Database statement execution time by SQL fingerprint",
+    ["operation", "fingerprint"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0],
+)
+db_slow_queries = metrics.counter(
+    "db_slow_queries_total",
+    "Statements slower than DB_SLOW_QUERY_THRESHOLD",
+    ["operation"],
+)
+
+_OTHER = "other"
+
+# 规范化规则：字面量和各种占位符统一替换为 ?，IN 列表折叠为一项
+_NORMALIZE_PATTERNS: List[Tuple["re.Pattern[str]", str]] = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+"), "?"),
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"(?:VALUES\s*\(\?\)\s*,?\s*)+", re.IGNORECASE), "VALUES (?) "),
+    (re.compile(r"\s+"), " "),
+]
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> Tuple[str, str, str]:
+    """计算SQL语句的指纹.
+
+    同一条语句仅参数不同时得到相同的指纹。
+
+    Args:
+        statement: 发送给数据库的SQL语句
+
+    Returns:
+        (语句类型, 指纹ID, 规范化后的SQL)
+    """
+    normalized = statement
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = normalized.strip()
+    operation = normalized.split(" ", 1)[0].upper() or "UNKNOWN"
+    digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]  # nosec B324
+    return operation, digest, normalized
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """描述绑定参数的结构而不记录参数值.
+
+    Args:
+        parameters: 绑定参数
+        executemany: 是否为批量执行
+
+    Returns:
+        参数类型结构，例如 {"id": "int"} 或 "500 x ['int', 'str']"
+    """
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+@dataclass
+class QueryStats:
+    """单个SQL指纹的汇总统计."""
+
+    fingerprint: str
+    operation: str
+    statement: str
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        """平均耗时（秒）."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+class QueryProfiler:
+    """SQL语句性能分析器."""
+
+    def __init__(self) -> None:
+        """初始化性能分析器."""
+        self._stats: Dict[str, QueryStats] = {}
+        # 同步驱动可能在多个线程中执行语句
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> None:
+        """为引擎注册计时事件.
+
+        Args:
+            engine: 同步引擎（异步引擎传入 engine.sync_engine）
+        """
+        if event.contains(engine, "before_cursor_execute", self._before_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def top(self, n: int = 10, order_by: str = "total_time") -> List[QueryStats]:
+        """返回最耗时的SQL指纹.
+
+        Args:
+            n: 返回数量
+            order_by: 排序字段，支持 total_time、mean_time、max_time、calls
+
+        Returns:
+            按指定字段降序排列的统计列表
+        """
+        with self._lock:
+            stats = list(self._stats.values())
+        return sorted(stats, key=lambda s: getattr(s, order_by), reverse=True)[:n]
+
+    def reset(self) -> None:
+        """清空统计数据."""
+        with self._lock:
+            self._stats.clear()
+
+    def dump(self, path: str) -> str:
+        """将统计数据写入JSON文件，供CLI生成报告.
+
+        每个进程写入 "path.<pid>"，多个工作进程不会互相覆盖，由 load() 合并。
+
+        Args:
+            path: 统计文件路径
+
+        Returns:
+            实际写入的文件路径
+        """
+        with self._lock:
+            rows = [asdict(stats) for stats in self._stats.values()]
+        target = f"{path}.{os.getpid()}"
+        Path(target).write_text(json.dumps(rows, ensure_ascii=False), encoding="utf-8")
+        return target
+
+    @staticmethod
+    def load(path: str) -> List[QueryStats]:
+        """读取并合并 dump() 写入的统计数据.
+
+        合并 path 本身（如存在）和所有 "path.<pid>" 文件，同一指纹的调用次数和
+        总耗时相加，最大耗时取最大值。
+
+        Args:
+            path: 统计文件路径
+
+        Returns:
+            统计列表
+        """
+        base = Path(path)
+        files = [
+            file
+            for file in base.parent.glob(f"{base.name}.*")
+            if file.suffix[1:].isdigit()
+        ]
+        if base.exists():
+            files.append(base)
+        if not files:
+            raise FileNotFoundError(f"No query stats found for {path}")
+
+        merged: Dict[str, QueryStats] = {}
+        for file in files:
+            for row in json.loads(file.read_text(encoding="utf-8")):
+                stats = merged.get(row["fingerprint"])
+                if stats is None:
+                    merged[row["fingerprint"]] = QueryStats(**row)
+                    continue
+                stats.calls += row["calls"]
+                stats.total_time += row["total_time"]
+                stats.max_time = max(stats.max_time, row["max_time"])
+        return list(merged.values())
+
+    def _before_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        """记录语句开始时间."""
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @staticmethod
+    def _handle_error(context: Any) -> None:
+        """语句执行失败时丢弃开始时间，避免计时栈错位."""
+        starts = (
+            context.connection.info.get("query_start_time")
+            if context.connection
+            else None
+        )
+        if starts:
+            starts.pop()
+
+    def _after_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        """记录语句耗时并检查是否为慢查询."""
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        operation, digest, normalized = fingerprint(statement)
+
+        with self._lock:
+            stats = self._stats.get(digest)
+            if stats is None and len(self._stats) < settings.DB_QUERY_FINGERPRINT_LIMIT:
+                stats = self._stats[digest] = QueryStats(digest, operation, normalized)
+            if stats is not None:
+                stats.calls += 1
+                stats.total_time += elapsed
+                stats.max_time = max(stats.max_time, elapsed)
+        if stats is None:
+            digest = _OTHER
+        db_query_seconds.labels(operation=operation, fingerprint=digest).observe(
+            elapsed
+        )
+
+        threshold = settings.DB_SLOW_QUERY_THRESHOLD
+        if threshold > 0 and elapsed >= threshold:
+            db_slow_queries.labels(operation=operation).inc()
+            logger.warning(
+                "Slow query",
+                duration=elapsed,
+                fingerprint=digest,
+                statement=normalized,
+                parameters=parameter_shape(parameters, executemany),
+                database=conn.engine.url.database,
+            )
+
+
+# 全局性能分析器实例
+query_profiler = QueryProfiler()
@@ -0,0 +1,178 @@
+"""缓存值序列化模块.
+
+提供 JSON、msgpack、pickle 三种编解码器以及可选的 zstd/lz4 压缩。
+编码后的数据以两字节头部标记编解码器和压缩算法，读取时自动识别。
+"""
+import json
+import pickle  # nosec B403
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
+
+def _json_dumps(value: Any) -> bytes:
+    """JSON编码，优先使用orjson."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """JSON解码."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    """msgpack编码."""
+    if msgpack is None:
+        raise RuntimeError("msgpack codec requires the 'msgpack' package")
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    """msgpack解码."""
+    if msgpack is None:
+        raise RuntimeError("msgpack codec requires the 'msgpack' package")
+    return msgpack.unpackb(data, raw=False)
+
+
+def _pickle_dumps(value: Any) -> bytes:
+    """pickle编码."""
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _pickle_loads(data: bytes) -> Any:
+    """pickle解码，仅用于受信任的Redis实例."""
+    return pickle.loads(data)  # nosec B301
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    """zstd压缩."""
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the 'zstandard' package")
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    """zstd解压."""
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the 'zstandard' package")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _lz4_compress(data: bytes) -> bytes:
+    """lz4压缩."""
+    if lz4_frame is None:
+        raise RuntimeError("lz4 compression requires the 'lz4' package")
+    return lz4_frame.compress(data)
+
+
+def _lz4_decompress(data: bytes) -> bytes:
+    """lz4解压."""
+    if lz4_frame is None:
+        raise RuntimeError("lz4 compression requires the 'lz4' package")
+    return lz4_frame.decompress(data)
+
+
+# 名称 -> (标记字节, 编码函数, 解码函数)
+CODECS: Dict[str, Tuple[int, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (1, _json_dumps, _json_loads),
+    "msgpack": (2, _msgpack_dumps, _msgpack_loads),
+    "pickle": (3, _pickle_dumps, _pickle_loads),
+}
+
+# 名称 -> (标记字节, 压缩函数, 解压函数)
+COMPRESSORS: Dict[
+    str, Tuple[int, Callable[[bytes], bytes], Callable[[bytes], bytes]]
+] = {
+    "none": (0, bytes, bytes),
+    "zstd": (1, _zstd_compress, _zstd_decompress),
+    "lz4": (2, _lz4_compress, _lz4_decompress),
+}
+
+_CODECS_BY_TAG = {tag: loads for tag, _, loads in CODECS.values()}
+_DECOMPRESSORS_BY_TAG = {tag: dec for tag, _, dec in COMPRESSORS.values()}
+
+
+class Serializer:
+    """缓存值序列化器."""
+
+    def __init__(
+        self,
+        codec: str = "json",
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+    ) -> None:
+        """初始化序列化器.
+
+        Args:
+            codec: 编解码器名称，支持 json、msgpack、pickle
+            compression: 压缩算法，支持 zstd、lz4，None 表示不压缩
+            compression_threshold: 超过该字节数才压缩
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported cache codec: {codec}")
+        compression = compression or "none"
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unsupported cache compression: {compression}")
+        self._codec_tag, self._encode, _ = CODECS[codec]
+        self._compression_tag, self._compress, _ = COMPRESSORS[compression]
+        self._compression_threshold = compression_threshold
+
+    def dumps(self, value: Any) -> bytes:
+        """编码缓存值.
+
+        Args:
+            value: 缓存值
+
+        Returns:
+            带头部标记的字节串
+        """
+        body = self._encode(value)
+        compression_tag = 0
+        if self._compression_tag and len(body) >= self._compression_threshold:
+            body = self._compress(body)
+            compression_tag = self._compression_tag
+        return bytes((self._codec_tag, compression_tag)) + body
+
+    def loads(self, data: Optional[bytes]) -> Any:
+        """解码缓存值.
+
+        根据头部标记选择编解码器，无法识别的数据视为旧版本写入的UTF-8字符串。
+
+        Args:
+            data: Redis返回的原始字节串
+
+        Returns:
+            缓存值
+        """
+        if data is None:
+            return None
+        if (
+            len(data) >= 2
+            and data[0] in _CODECS_BY_TAG
+            and data[1] in _DECOMPRESSORS_BY_TAG
+        ):
+            body = _DECOMPRESSORS_BY_TAG[data[1]](data[2:])
+            return _CODECS_BY_TAG[data[0]](body)
+        return data.decode("utf-8")
@@ -0,0 +1,522 @@
+"""持久化任务队列模块.
+
+为后台任务提供可插拔的队列后端：Redis Stream（生产环境）、SQLite（单机多进程）
+和进程内队列（测试）。工作进程取出任务后必须确认，超过可见性超时仍未确认的任务
+会重新投递给其他工作进程，保证至少一次投递。投递次数超过上限或重试耗尽的任务
+移入死信记录，不再投递。
+"""
+import asyncio
+import json
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from src.config.settings import settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class QueuedTask:
+    """从队列取出的任务."""
+
+    id: str
+    name: str
+    args: List[Any] = field(default_factory=list)
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    # 包括本次在内的投递次数
+    deliveries: int = 1
+
+    @property
+    def redelivered(self) -> bool:
+        """是否为超时未确认后的重新投递."""
+        return self.deliveries > 1
+
+    def dumps(self) -> str:
+        """编码任务内容（不含ID）."""
+        return json.dumps({"name": self.name, "args": self.args, "kwargs": self.kwargs})
+
+    @classmethod
+    def loads(cls, task_id: str, data: str, deliveries: int = 1) -> "QueuedTask":
+        """解码任务内容.
+
+        Args:
+            task_id: 任务ID
+            data: dumps() 的结果
+            deliveries: 投递次数
+
+        Returns:
+            任务
+        """
+        return cls(id=task_id, deliveries=deliveries, **json.loads(data))
+
+
+class TaskQueue(ABC):
+    """任务队列后端接口."""
+
+    @abstractmethod
+    async def enqueue(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+        """提交任务.
+
+        Args:
+            name: 任务名称
+            args: 位置参数，必须可JSON序列化
+            kwargs: 关键字参数，必须可JSON序列化
+
+        Returns:
+            任务ID
+        """
+
+    @abstractmethod
+    async def dequeue(self, consumer: str, count: int, wait: float) -> List[QueuedTask]:
+        """取出任务，任务在可见性超时内对其他消费者不可见.
+
+        Args:
+            consumer: 消费者名称
+            count: 最多取出的任务数
+            wait: 队列为空时最长等待时间（秒）
+
+        Returns:
+            任务列表
+        """
+
+    @abstractmethod
+    async def ack(self, task: QueuedTask) -> None:
+        """确认任务已处理完成并从队列中移除.
+
+        Args:
+            task: 任务
+        """
+
+    @abstractmethod
+    async def extend(self, task: QueuedTask, consumer: str) -> None:
+        """续期任务的可见性超时，执行时间较长的任务在执行期间定期调用.
+
+        Args:
+            task: 任务
+            consumer: 取出该任务的消费者名称
+        """
+
+    @abstractmethod
+    async def dead_letter(self, task: QueuedTask, reason: str) -> None:
+        """将任务移入死信记录并从队列中移除.
+
+        Args:
+            task: 任务
+            reason: 原因，例如 failed、max_deliveries
+        """
+
+    async def close(self) -> None:
+        """释放后端资源，可选实现，默认不做任何操作."""
+        return None
+
+
+class MemoryTaskQueue(TaskQueue):
+    """进程内任务队列，仅用于测试和单进程开发环境."""
+
+    def __init__(self, visibility_timeout: float) -> None:
+        """初始化队列.
+
+        Args:
+            visibility_timeout: 可见性超时（秒）
+        """
+        self._visibility_timeout = visibility_timeout
+        self._ready: Deque[QueuedTask] = deque()
+        # 任务ID -> (可见性截止时间, 任务)，按取出顺序排列
+        self._inflight: "OrderedDict[str, Tuple[float, QueuedTask]]" = OrderedDict()
+        self._available = asyncio.Event()
+        # (任务, 原因)，超出 TASK_DEAD_LETTER_MAX_SIZE 时丢弃最早的记录
+        self.dead_letters: Deque[Tuple[QueuedTask, str]] = deque(
+            maxlen=settings.TASK_DEAD_LETTER_MAX_SIZE
+        )
+
+    async def enqueue(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+        """提交任务."""
+        task = QueuedTask(uuid.uuid4().hex, name, list(args), dict(kwargs), 0)
+        self._ready.append(task)
+        self._available.set()
+        return task.id
+
+    async def dequeue(self, consumer: str, count: int, wait: float) -> List[QueuedTask]:
+        """取出任务."""
+        self._requeue_expired()
+        if not self._ready:
+            self._available.clear()
+            try:
+                await asyncio.wait_for(self._available.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                return []
+
+        deadline = time.monotonic() + self._visibility_timeout
+        tasks: List[QueuedTask] = []
+        while self._ready and len(tasks) < count:
+            task = self._ready.popleft()
+            task.deliveries += 1
+            self._inflight[task.id] = (deadline, task)
+            tasks.append(task)
+        return tasks
+
+    async def ack(self, task: QueuedTask) -> None:
+        """确认任务."""
+        self._inflight.pop(task.id, None)
+
+    async def extend(self, task: QueuedTask, consumer: str) -> None:
+        """续期任务，已超时放回队列的任务不再续期."""
+        if task.id in self._inflight:
+            self._inflight[task.id] = (
+                time.monotonic() + self._visibility_timeout,
+                task,
+            )
+
+    async def dead_letter(self, task: QueuedTask, reason: str) -> None:
+        """将任务移入死信记录."""
+        self._inflight.pop(task.id, None)
+        self.dead_letters.append((task, reason))
+
+    def _requeue_expired(self) -> None:
+        """将超过可见性超时的任务放回队首."""
+        now = time.monotonic()
+        expired = [
+            task for deadline, task in self._inflight.values() if deadline <= now
+        ]
+        for task in reversed(expired):
+            del self._inflight[task.id]
+            self._ready.appendleft(task)
+
+
+class SQLiteTaskQueue(TaskQueue):
+    """基于SQLite的任务队列，同一台机器上的多个工作进程可共享."""
+
+    def __init__(self, path: str, visibility_timeout: float) -> None:
+        """初始化队列.
+
+        Args:
+            path: 数据库文件路径
+            visibility_timeout: 可见性超时（秒）
+        """
+        self._path = path
+        self._visibility_timeout = visibility_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        # sqlite3 连接不能并发使用，所有操作串行执行
+        self._lock = asyncio.Lock()
+
+    async def enqueue(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+        """提交任务."""
+        task = QueuedTask("", name, list(args), dict(kwargs))
+
+        def insert(conn: sqlite3.Connection) -> str:
+            cursor = conn.execute(
+                "INSERT INTO task_queue (payload, visible_at, deliveries)"
+                " VALUES (?, 0, 0)",
+                (task.dumps(),),
+            )
+            return str(cursor.lastrowid)
+
+        return await self._run(insert)
+
+    async def dequeue(self, consumer: str, count: int, wait: float) -> List[QueuedTask]:
+        """取出任务，队列为空时轮询直至超时."""
+        deadline = time.monotonic() + wait
+        while True:
+            tasks = await self._run(lambda conn: self._claim(conn, count))
+            if tasks or time.monotonic() >= deadline:
+                return tasks
+            await asyncio.sleep(min(settings.TASK_QUEUE_POLL_INTERVAL, wait))
+
+    async def ack(self, task: QueuedTask) -> None:
+        """确认任务."""
+
+        def delete(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM task_queue WHERE id = ?", (int(task.id),))
+
+        await self._run(delete)
+
+    async def extend(self, task: QueuedTask, consumer: str) -> None:
+        """推迟任务的可见时间."""
+
+        def touch(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "UPDATE task_queue SET visible_at = ? WHERE id = ?",
+                (time.time() + self._visibility_timeout, int(task.id)),
+            )
+
+        await self._run(touch)
+
+    async def dead_letter(self, task: QueuedTask, reason: str) -> None:
+        """在同一事务中将任务移入死信表."""
+
+        def move(conn: sqlite3.Connection) -> None:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO task_dead_letter"
+                    " (task_id, payload, deliveries, reason, failed_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (task.id, task.dumps(), task.deliveries, reason, time.time()),
+                )
+                conn.execute("DELETE FROM task_queue WHERE id = ?", (int(task.id),))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(move)
+
+    async def close(self) -> None:
+        """关闭数据库连接."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _claim(self, conn: sqlite3.Connection, count: int) -> List[QueuedTask]:
+        """在写事务中取出可见的任务并推迟其可见时间.
+
+        Args:
+            conn: 数据库连接
+            count: 最多取出的任务数
+
+        Returns:
+            任务列表
+        """
+        now = time.time()
+        # BEGIN IMMEDIATE 获取写锁，多个进程不会取出同一任务
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, payload, deliveries FROM task_queue"
+                " WHERE visible_at <= ? ORDER BY id LIMIT ?",
+                (now, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE task_queue SET visible_at = ?, deliveries = deliveries + 1"
+                " WHERE id = ?",
+                [(now + self._visibility_timeout, row[0]) for row in rows],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [
+            QueuedTask.loads(str(task_id), payload, deliveries=deliveries + 1)
+            for task_id, payload, deliveries in rows
+        ]
+
+    async def _run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        """在线程中执行数据库操作.
+
+        Args:
+            operation: 接收连接参数的函数
+
+        Returns:
+            操作结果
+        """
+        async with self._lock:
+            if self._conn is None:
+                self._conn = await asyncio.to_thread(self._open)
+            return await asyncio.to_thread(operation, self._conn)
+
+    def _open(self) -> sqlite3.Connection:
+        """打开数据库并创建队列表."""
+        # 自动提交模式，只有 _claim 显式开启事务
+        conn = sqlite3.connect(
+            self._path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_queue ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " payload TEXT NOT NULL,"
+            " visible_at REAL NOT NULL,"
+            " deliveries INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS task_queue_visible ON task_queue (visible_at)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_dead_letter ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " task_id TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " deliveries INTEGER NOT NULL,"
+            " reason TEXT NOT NULL,"
+            " failed_at REAL NOT NULL)"
+        )
+        return conn
+
+
+class RedisTaskQueue(TaskQueue):
+    """基于Redis Stream消费者组的任务队列，可在多台机器间扩展工作进程."""
+
+    def __init__(self, stream: str, group: str, visibility_timeout: float) -> None:
+        """初始化队列.
+
+        Args:
+            stream: Stream键名
+            group: 消费者组名称
+            visibility_timeout: 可见性超时（秒），超时未确认的消息会被其他消费者认领
+        """
+        self._stream = stream
+        self._group = group
+        self._visibility_timeout = visibility_timeout
+        self._group_ready = False
+
+    async def enqueue(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> str:
+        """提交任务."""
+        client = await self._client()
+        task = QueuedTask("", name, list(args), dict(kwargs))
+        task_id = await client.xadd(self._stream, {"task": task.dumps()})
+        return task_id.decode() if isinstance(task_id, bytes) else task_id
+
+    async def dequeue(self, consumer: str, count: int, wait: float) -> List[QueuedTask]:
+        """先认领超时未确认的消息，再读取新消息."""
+        client = await self._client()
+        _, claimed, *_ = await client.xautoclaim(
+            self._stream,
+            self._group,
+            consumer,
+            min_idle_time=int(self._visibility_timeout * 1000),
+            start_id="0-0",
+            count=count,
+        )
+        tasks = [self._decode(entry) for entry in claimed]
+        if tasks:
+            await self._load_deliveries(client, tasks)
+            return tasks
+
+        # 阻塞时间需小于套接字超时
+        block = min(wait, settings.REDIS_SOCKET_TIMEOUT / 2)
+        start = time.monotonic()
+        response = await client.xreadgroup(
+            self._group,
+            consumer,
+            {self._stream: ">"},
+            count=count,
+            block=max(1, int(block * 1000)),
+        )
+        if not response:
+            # 服务端未阻塞时（例如进程内替身）补足等待时间，避免空转
+            await asyncio.sleep(max(0.0, block - (time.monotonic() - start)))
+            return []
+        return [self._decode(entry) for _, entries in response for entry in entries]
+
+    async def ack(self, task: QueuedTask) -> None:
+        """确认并删除消息."""
+        client = await self._client()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.xack(self._stream, self._group, task.id)
+            pipe.xdel(self._stream, task.id)
+            await pipe.execute()
+
+    async def extend(self, task: QueuedTask, consumer: str) -> None:
+        """由当前消费者重新认领消息以重置空闲时间，JUSTID 不增加投递次数."""
+        client = await self._client()
+        await client.xclaim(
+            self._stream,
+            self._group,
+            consumer,
+            min_idle_time=0,
+            message_ids=[task.id],
+            justid=True,
+        )
+
+    async def dead_letter(self, task: QueuedTask, reason: str) -> None:
+        """将消息写入死信Stream（"<stream>:dead"）后确认并删除.
+
+        两个键在集群模式下可能位于不同槽，不能放在同一个事务中。先写入死信再确认，
+        中途失败时消息仍未确认，会重新投递并再次移入死信，不会丢失。
+        """
+        client = await self._client()
+        await client.xadd(
+            f"{self._stream}:dead",
+            {
+                "id": task.id,
+                "task": task.dumps(),
+                "deliveries": task.deliveries,
+                "reason": reason,
+            },
+            maxlen=settings.TASK_DEAD_LETTER_MAX_SIZE,
+            approximate=True,
+        )
+        await self.ack(task)
+
+    async def _load_deliveries(self, client: Any, tasks: List[QueuedTask]) -> None:
+        """从待确认列表读取认领消息的投递次数.
+
+        Args:
+            client: Redis客户端
+            tasks: 认领的任务
+        """
+        async with client.pipeline(transaction=False) as pipe:
+            for task in tasks:
+                pipe.xpending_range(
+                    self._stream, self._group, min=task.id, max=task.id, count=1
+                )
+            responses = await pipe.execute()
+        for task, pending in zip(tasks, responses, strict=True):
+            # XAUTOCLAIM 认领时已增加投递次数
+            task.deliveries = pending[0]["times_delivered"] if pending else 2
+
+    async def _client(self) -> Any:
+        """返回Redis客户端，首次使用时创建消费者组."""
+        # 延迟导入，避免模块加载时建立缓存连接
+        from src.core.cache import cache
+
+        client = await cache.client()
+        if not self._group_ready:
+            try:
+                await client.xgroup_create(
+                    self._stream, self._group, id="0", mkstream=True
+                )
+            except Exception as e:
+                # 消费者组已存在
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._group_ready = True
+        return client
+
+    @staticmethod
+    def _decode(entry: Tuple[Any, Dict[Any, Any]]) -> QueuedTask:
+        """解码Stream消息.
+
+        Args:
+            entry: (消息ID, 字段)
+
+        Returns:
+            任务
+        """
+        task_id, fields = entry
+        if isinstance(task_id, bytes):
+            task_id = task_id.decode()
+        data = fields[b"task"] if b"task" in fields else fields["task"]
+        if isinstance(data, bytes):
+            data = data.decode()
+        return QueuedTask.loads(task_id, data)
+
+
+def create_task_queue(backend: Optional[str] = None) -> TaskQueue:
+    """按 TASK_QUEUE_BACKEND 创建任务队列.
+
+    Args:
+        backend: 后端名称，支持 memory、sqlite、redis
+
+    Returns:
+        任务队列
+    """
+    backend = backend or settings.TASK_QUEUE_BACKEND
+    timeout = settings.TASK_VISIBILITY_TIMEOUT
+    if backend == "memory":
+        return MemoryTaskQueue(timeout)
+    if backend == "sqlite":
+        return SQLiteTaskQueue(settings.TASK_QUEUE_SQLITE_PATH, timeout)
+    if backend == "redis":
+        return RedisTaskQueue(
+            settings.TASK_QUEUE_NAME, settings.TASK_QUEUE_GROUP, timeout
+        )
+    raise ValueError(f"Unsupported task queue backend: {backend}")
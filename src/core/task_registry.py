@@ -0,0 +1,183 @@
+"""后台任务运行记录模块.
+
+每次调用后台任务都会生成一条带唯一ID的运行记录，保存状态、时间戳和耗时。
+运行中的记录按ID索引，同时按任务名称分组；结束的记录移入有界的历史队列，
+超出 TASK_HISTORY_SIZE 后淘汰最早的记录。
+"""
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+
+# 运行状态
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class TaskRun:
+    """单次后台任务运行."""
+
+    id: str
+    name: str
+    state: str = PENDING
+    created_at: datetime = field(default_factory=datetime.now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    task: Optional["asyncio.Task[Any]"] = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """执行耗时（秒），未开始时为None，运行中时为已执行的时间."""
+        if self.started_at is None:
+            return None
+        end = self.finished_at or datetime.now()
+        return (end - self.started_at).total_seconds()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "type": "background",
+            "status": self.state,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration": self.duration,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class TaskRegistry:
+    """后台任务运行记录表."""
+
+    def __init__(self, history_size: Optional[int] = None) -> None:
+        """初始化记录表.
+
+        Args:
+            history_size: 保留的已结束记录数，默认为 TASK_HISTORY_SIZE
+        """
+        self._history_size = (
+            settings.TASK_HISTORY_SIZE if history_size is None else history_size
+        )
+        # 运行ID -> 未结束的记录
+        self._active: Dict[str, TaskRun] = {}
+        # 任务名称 -> 运行ID -> 未结束的记录
+        self._by_name: Dict[str, Dict[str, TaskRun]] = {}
+        # 已结束的记录，按结束顺序排列
+        self._history: "OrderedDict[str, TaskRun]" = OrderedDict()
+
+    def create(self, name: str) -> TaskRun:
+        """登记一次新的运行.
+
+        Args:
+            name: 任务名称
+
+        Returns:
+            运行记录
+        """
+        run = TaskRun(id=uuid.uuid4().hex, name=name)
+        self._active[run.id] = run
+        self._by_name.setdefault(name, {})[run.id] = run
+        return run
+
+    def attach(self, run: TaskRun, task: "asyncio.Task[Any]") -> None:
+        """关联执行该运行的协程任务，任务结束时自动记录结果.
+
+        Args:
+            run: 运行记录
+            task: 协程任务
+        """
+        run.task = task
+        task.add_done_callback(lambda t: self._finish(run, t))
+
+    @staticmethod
+    def start_attempt(run: TaskRun) -> None:
+        """记录一次执行尝试开始.
+
+        Args:
+            run: 运行记录
+        """
+        if run.started_at is None:
+            run.started_at = datetime.now()
+        run.state = RUNNING
+        run.attempts += 1
+
+    def get(self, run_id: str) -> Optional[TaskRun]:
+        """按运行ID查找记录.
+
+        Args:
+            run_id: 运行ID
+
+        Returns:
+            运行记录，不存在或已淘汰时为None
+        """
+        return self._active.get(run_id) or self._history.get(run_id)
+
+    def active(self, name: Optional[str] = None) -> List[TaskRun]:
+        """返回未结束的运行.
+
+        Args:
+            name: 只返回指定任务名称的运行
+
+        Returns:
+            运行记录列表
+        """
+        if name is None:
+            return list(self._active.values())
+        return list(self._by_name.get(name, {}).values())
+
+    def history(self, limit: Optional[int] = None) -> List[TaskRun]:
+        """返回最近结束的运行，最新的在前.
+
+        Args:
+            limit: 返回数量，None 表示全部
+
+        Returns:
+            运行记录列表
+        """
+        runs: List[TaskRun] = []
+        for run in reversed(self._history.values()):
+            if limit is not None and len(runs) >= limit:
+                break
+            runs.append(run)
+        return runs
+
+    def _finish(self, run: TaskRun, task: "asyncio.Task[Any]") -> None:
+        """任务结束时记录结果并移入历史.
+
+        Args:
+            run: 运行记录
+            task: 已结束的协程任务
+        """
+        run.finished_at = datetime.now()
+        if task.cancelled():
+            run.state = CANCELLED
+        elif task.exception() is not None:
+            run.state = FAILED
+            run.error = repr(task.exception())
+        else:
+            run.state = COMPLETED
+        run.task = None
+
+        self._active.pop(run.id, None)
+        runs = self._by_name.get(run.name)
+        if runs is not None:
+            runs.pop(run.id, None)
+            if not runs:
+                del self._by_name[run.name]
+        if self._history_size > 0:
+            self._history[run.id] = run
+            while len(self._history) > self._history_size:
+                self._history.popitem(last=False)
@@ -0,0 +1,252 @@
+"""后台任务重试策略模块.
+
+提供带完全抖动的指数退避、按任务名称的重试预算和熔断器。依赖故障时，
+抖动使各任务的重试时间错开，重试预算限制重试占全部执行的比例，熔断器在错误率
+超过阈值后直接拒绝执行，给依赖恢复的时间。
+"""
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple, Type
+
+from src.config.settings import settings
+from src.monitoring.metrics import metrics
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 熔断器状态，数值用于指标
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+task_retries = metrics.counter(
+    "task_retries_total",
+    "Background task retry decisions by outcome "
+    "(retried/exhausted/budget_exhausted/not_retryable)",
+    ["name", "outcome"],
+)
+task_circuit_state = metrics.gauge(
+    "task_circuit_state",
+    "Background task circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["name"],
+)
+task_circuit_rejections = metrics.counter(
+    "task_circuit_rejections_total",
+    "Background task runs rejected by an open circuit breaker",
+    ["name"],
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """熔断器处于打开状态，任务未执行."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """后台任务的重试参数."""
+
+    max_retries: int = 3
+    # 退避的基础延迟和上限（秒）
+    retry_delay: float = 5.0
+    max_retry_delay: float = 300.0
+    # 只有这些异常才重试
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+
+    def delay(self, attempt: int) -> float:
+        """计算第 attempt 次重试前的等待时间.
+
+        Args:
+            attempt: 已重试次数，从0开始
+
+        Returns:
+            等待时间（秒）
+        """
+        return backoff_delay(attempt, self.retry_delay, self.max_retry_delay)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """计算带完全抖动的指数退避延迟.
+
+    Args:
+        attempt: 已重试次数，从0开始
+        base: 基础延迟（秒）
+        cap: 延迟上限（秒）
+
+    Returns:
+        0 到 min(cap, base * 2^attempt) 之间的随机延迟
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))  # nosec B311
+
+
+class RetryBudget:
+    """按任务名称的重试预算.
+
+    每次执行存入 ratio 个令牌，并按 min_per_second 的速率持续补充，每次重试
+    取出一个令牌，令牌不足时不再重试。令牌数上限为 capacity。
+    """
+
+    def __init__(
+        self,
+        ratio: Optional[float] = None,
+        min_per_second: Optional[float] = None,
+        capacity: Optional[float] = None,
+    ) -> None:
+        """初始化重试预算.
+
+        Args:
+            ratio: 每次执行存入的令牌数，默认为 TASK_RETRY_BUDGET_RATIO
+            min_per_second: 每秒补充的令牌数，默认为 TASK_RETRY_BUDGET_MIN_PER_SECOND
+            capacity: 令牌数上限，默认为 TASK_RETRY_BUDGET_CAPACITY
+        """
+        self._ratio = settings.TASK_RETRY_BUDGET_RATIO if ratio is None else ratio
+        self._min_per_second = (
+            settings.TASK_RETRY_BUDGET_MIN_PER_SECOND
+            if min_per_second is None
+            else min_per_second
+        )
+        self._capacity = (
+            settings.TASK_RETRY_BUDGET_CAPACITY if capacity is None else capacity
+        )
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    def deposit(self) -> None:
+        """记录一次执行."""
+        self._refill()
+        self._tokens = min(self._capacity, self._tokens + self._ratio)
+
+    def withdraw(self) -> bool:
+        """申请一次重试.
+
+        Returns:
+            预算是否允许重试
+        """
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _refill(self) -> None:
+        """按经过的时间补充令牌."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._updated) * self._min_per_second,
+        )
+        self._updated = now
+
+
+class CircuitBreaker:
+    """基于滑动窗口错误率的熔断器.
+
+    最近 window 次执行中至少有 min_calls 次且错误率达到 error_rate 时打开，
+    打开 reset_timeout 秒后进入半开状态，只放行一次试探执行，成功则关闭，
+    失败则重新打开。error_rate 为0时不熔断。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        error_rate: Optional[float] = None,
+        window: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        reset_timeout: Optional[float] = None,
+    ) -> None:
+        """初始化熔断器.
+
+        Args:
+            name: 任务名称
+            error_rate: 触发熔断的错误率，默认为 TASK_BREAKER_ERROR_RATE
+            window: 统计的最近执行次数，默认为 TASK_BREAKER_WINDOW
+            min_calls: 计算错误率所需的最少执行次数，默认为 TASK_BREAKER_MIN_CALLS
+            reset_timeout: 打开后进入半开状态的时间（秒），默认为
+                TASK_BREAKER_RESET_TIMEOUT
+        """
+        self.name = name
+        self._error_rate = (
+            settings.TASK_BREAKER_ERROR_RATE if error_rate is None else error_rate
+        )
+        self._min_calls = (
+            settings.TASK_BREAKER_MIN_CALLS if min_calls is None else min_calls
+        )
+        self._reset_timeout = (
+            settings.TASK_BREAKER_RESET_TIMEOUT
+            if reset_timeout is None
+            else reset_timeout
+        )
+        # 最近的执行结果，True 表示失败
+        self._outcomes: Deque[bool] = deque(
+            maxlen=settings.TASK_BREAKER_WINDOW if window is None else window
+        )
+        self._opened_at = 0.0
+        self._probing = False
+        self._set_state(CLOSED)
+
+    def allow(self) -> bool:
+        """判断是否允许执行，不允许时计入拒绝次数.
+
+        Returns:
+            是否允许执行
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at >= self._reset_timeout:
+                self._set_state(HALF_OPEN)
+            else:
+                task_circuit_rejections.labels(name=self.name).inc()
+                return False
+        if self.state == HALF_OPEN:
+            if self._probing:
+                task_circuit_rejections.labels(name=self.name).inc()
+                return False
+            self._probing = True
+        return True
+
+    def record(self, success: bool) -> None:
+        """记录执行结果.
+
+        Args:
+            success: 是否成功
+        """
+        if self.state == OPEN:
+            # 打开前已开始的执行，不延长打开时间
+            return
+        if self.state == HALF_OPEN:
+            self._probing = False
+            self._outcomes.clear()
+            if success:
+                self._set_state(CLOSED)
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(not success)
+        if (
+            self._error_rate > 0
+            and len(self._outcomes) >= self._min_calls
+            and sum(self._outcomes) / len(self._outcomes) >= self._error_rate
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """执行被取消时释放半开状态的试探名额."""
+        self._probing = False
+
+    def _open(self) -> None:
+        """打开熔断器."""
+        self._opened_at = time.monotonic()
+        if self.state != OPEN:
+            logger.warning("Task circuit breaker opened", name=self.name)
+        self._set_state(OPEN)
+
+    def _set_state(self, state: str) -> None:
+        """切换状态并更新指标.
+
+        Args:
+            state: 新状态
+        """
+        self.state = state
+        task_circuit_state.labels(name=self.name).set(_STATE_VALUES[state])
@@ -1,37 +1,211 @@
 """任务管理模块."""
 import asyncio
+import importlib
+import os
+import socket
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from functools import partial, wraps
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from src.config.settings import settings
+from src.core.task_queue import QueuedTask, TaskQueue, create_task_queue
+from src.core.task_registry import TaskRegistry, TaskRun
+from src.core.task_retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    RetryPolicy,
+    task_retries,
+)
+from src.monitoring.metrics import metrics
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# 持久化队列任务处理结果
+queued_tasks = metrics.counter(
+    "task_queue_tasks_total",
+    "Queued tasks processed by workers "
+    "(completed/failed/redelivered/shed/dead_lettered)",
+    ["name", "result"],
+)
+
+# 并发与背压指标
+task_running = metrics.gauge(
+    "task_running", "Background task attempts currently executing", ["name"]
+)
+task_wait_seconds = metrics.histogram(
+    "task_wait_seconds",
+    "Time background tasks wait before running, by stage (queue/slot)",
+    ["name", "stage"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0],
+)
+task_submissions = metrics.counter(
+    "task_submissions_total",
+    "Task submissions by result (accepted/rejected/dropped)",
+    ["result"],
+)
+task_submit_queue_depth = metrics.gauge(
+    "task_submit_queue_depth", "Submissions waiting in the bounded queue"
+)
+
 T = TypeVar("T")
 
+# 支持的执行方式
+EXECUTORS = ("loop", "thread", "process")
+
+# "模块:限定名" -> 原始任务函数。装饰器替换了模块中的同名对象，函数本身无法
+# 按名称序列化，因此进程池只传递键名，由子进程导入模块后在此查找
+_process_functions: Dict[str, Callable[..., Any]] = {}
+
+
+def _call_sync(func: Callable[..., Any], args: Any, kwargs: Dict[str, Any]) -> Any:
+    """在工作线程或子进程中调用任务函数，协程函数在独立的事件循环中运行.
+
+    Args:
+        func: 任务函数
+        args: 位置参数
+        kwargs: 关键字参数
+
+    Returns:
+        任务结果
+    """
+    result = func(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+def _call_registered(key: str, args: Any, kwargs: Dict[str, Any]) -> Any:
+    """在子进程中按键名查找并调用任务函数.
+
+    Args:
+        key: "模块:限定名"
+        args: 位置参数
+        kwargs: 关键字参数
+
+    Returns:
+        任务结果
+    """
+    if key not in _process_functions:
+        # spawn 启动的子进程需要重新导入模块以执行装饰器完成注册
+        importlib.import_module(key.split(":", 1)[0])
+    return _call_sync(_process_functions[key], args, kwargs)
+
+
+class TaskRejectedError(RuntimeError):
+    """提交队列已满且溢出策略为 reject."""
+
+
+class TaskDroppedError(RuntimeError):
+    """提交队列已满时被 drop_oldest 策略丢弃."""
+
+
+@dataclass
+class _Submission:
+    """等待执行的提交."""
+
+    func: Callable[..., Awaitable[Any]]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    future: "asyncio.Future[Any]"
+    name: str
+    enqueued_at: float = field(default_factory=time.monotonic)
+
 
 class TaskManager:
     """任务管理器."""
 
     def __init__(self) -> None:
         """初始化任务管理器."""
-        self._tasks: Dict[str, asyncio.Task] = {}
+        # 后台任务运行记录，按运行ID索引
+        self.registry = TaskRegistry()
+        # 按任务名称的重试预算和熔断器
+        self._retry_budgets: Dict[str, RetryBudget] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # 持久化任务名称 -> 带重试的执行函数，由工作进程按名称调用
+        self._handlers: Dict[str, Callable[..., Awaitable[None]]] = {}
+        self._queue: Optional[TaskQueue] = None
         self._scheduler = AsyncIOScheduler()
-        self._scheduler.start()
+        # 全局和按任务名称的并发限制
+        self._global_limit = asyncio.Semaphore(settings.TASK_MAX_CONCURRENCY)
+        self._name_limits: Dict[str, asyncio.Semaphore] = {}
+        # 有界提交队列及其调度协程
+        self._submissions: Deque[_Submission] = deque()
+        self._submit_cond = asyncio.Condition()
+        self._dispatchers: List[asyncio.Task] = []
+        # 按需创建的线程池和进程池
+        self._executors: Dict[str, Executor] = {}
+        self._closing = False
+
+    def start(self) -> None:
+        """在事件循环中启动定时任务调度器.
+
+        调度器需要运行中的事件循环，因此不在导入模块时启动。
+        """
+        self._closing = False
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    @property
+    def queue(self) -> TaskQueue:
+        """持久化任务队列，首次使用时按 TASK_QUEUE_BACKEND 创建."""
+        if self._queue is None:
+            self._queue = create_task_queue()
+        return self._queue
 
     def background_task(
-        self, name: Optional[str] = None, max_retries: int = 3, retry_delay: int = 5
+        self,
+        name: Optional[str] = None,
+        max_retries: int = 3,
+        retry_delay: float = 5,
+        durable: bool = False,
+        concurrency: Optional[int] = None,
+        executor: str = "loop",
+        retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+        max_retry_delay: Optional[float] = None,
     ) -> Callable:
         """后台任务装饰器.
 
+        每次执行同时受 TASK_MAX_CONCURRENCY 全局限制和 concurrency 限制。
+        CPU密集型任务应使用 thread 或 process 执行方式，避免阻塞事件循环。
+
+        失败后按带完全抖动的指数退避重试，同名任务共享重试预算，错误率过高时
+        熔断器直接拒绝执行并抛出 CircuitOpenError。
+
         Args:
             name: 任务名称
             max_retries: 最大重试次数
-            retry_delay: 重试延迟（秒）
+            retry_delay: 退避的基础延迟（秒）
+            durable: 是否提交到持久化队列，由工作进程执行。调用时只入队并返回
+                任务ID，参数必须可JSON序列化
+            concurrency: 同名任务的最大并发数，None 表示只受全局限制
+            executor: 执行方式，loop 在事件循环中执行，thread 和 process 分别交给
+                线程池和进程池执行。process 方式的函数须定义在模块顶层，参数和
+                返回值必须可pickle序列化
+            retry_on: 需要重试的异常类型，其他异常直接失败
+            max_retry_delay: 退避延迟上限（秒），默认为 TASK_RETRY_MAX_DELAY
 
         Returns:
             装饰器函数
@@ -39,39 +213,478 @@ class TaskManager:
 
         def decorator(func: Callable) -> Callable:
             task_name = name or func.__name__
+            self._register_executor(func, executor)
+            if concurrency is not None:
+                self._name_limits[task_name] = asyncio.Semaphore(concurrency)
+            self._retry_budgets[task_name] = RetryBudget()
+            self._breakers[task_name] = CircuitBreaker(task_name)
+            policy = RetryPolicy(
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                max_retry_delay=(
+                    settings.TASK_RETRY_MAX_DELAY
+                    if max_retry_delay is None
+                    else max_retry_delay
+                ),
+                retry_on=retry_on,
+            )
 
-            @wraps(func)
-            async def wrapper(*args: Any, **kwargs: Any) -> None:
-                retries = 0
-                while retries <= max_retries:
-                    try:
-                        task = asyncio.create_task(func(*args, **kwargs))
-                        self._tasks[task_name] = task
-                        await task
-                        break
-                    except Exception as e:
-                        retries += 1
-                        if retries > max_retries:
-                            logger.error(
-                                f"Task {task_name} failed after {max_retries} retries",
-                                exc_info=e,
-                            )
-                            raise
-                        logger.warning(
-                            f"Task {task_name} failed, retrying in {retry_delay} seconds",
-                            exc_info=e,
+            async def run(*args: Any, **kwargs: Any) -> None:
+                # 关闭时不检查 _closing，队列中已提交的任务仍需执行完
+                run_record = self.registry.create(task_name)
+                task = asyncio.create_task(
+                    self._run_with_retries(
+                        run_record, func, args, kwargs, policy, executor
+                    )
+                )
+                self.registry.attach(run_record, task)
+                await task
+
+            if durable:
+                self._handlers[task_name] = run
+
+                @wraps(func)
+                async def enqueue(*args: Any, **kwargs: Any) -> str:
+                    if self._closing:
+                        raise RuntimeError(
+                            f"Task manager is shutting down: {task_name}"
                         )
-                        await asyncio.sleep(retry_delay)
-                    finally:
-                        if task_name in self._tasks:
-                            del self._tasks[task_name]
+                    return await self.queue.enqueue(task_name, list(args), kwargs)
 
-            return wrapper
+                return enqueue
+
+            return wraps(func)(run)
 
         return decorator
 
+    async def _run_with_retries(
+        self,
+        run_record: TaskRun,
+        func: Callable,
+        args: Any,
+        kwargs: Dict[str, Any],
+        policy: RetryPolicy,
+        executor: str = "loop",
+    ) -> None:
+        """执行任务，失败时按退避策略重试.
+
+        Args:
+            run_record: 运行记录
+            func: 任务函数
+            args: 位置参数
+            kwargs: 关键字参数
+            policy: 重试参数
+            executor: 执行方式
+        """
+        task_name = run_record.name
+        budget = self._retry_budgets[task_name]
+        breaker = self._breakers[task_name]
+        budget.deposit()
+        retries = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit breaker is open: {task_name}")
+            try:
+                async with self._slot(task_name):
+                    self.registry.start_attempt(run_record)
+                    await self._call(func, args, kwargs, executor)
+            except Exception as e:
+                breaker.record(False)
+                if not isinstance(e, policy.retry_on):
+                    outcome = "not_retryable"
+                elif retries >= policy.max_retries:
+                    outcome = "exhausted"
+                elif not budget.withdraw():
+                    outcome = "budget_exhausted"
+                else:
+                    outcome = "retried"
+                task_retries.labels(name=task_name, outcome=outcome).inc()
+                if outcome != "retried":
+                    logger.error(
+                        f"Task {task_name} failed after {retries} retries",
+                        reason=outcome,
+                        exc_info=e,
+                    )
+                    raise
+                delay = policy.delay(retries)
+                retries += 1
+                logger.warning(
+                    f"Task {task_name} failed, retrying in {delay:.2f} seconds",
+                    exc_info=e,
+                )
+                await asyncio.sleep(delay)
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                breaker.record(True)
+                return
+
+    def _register_executor(self, func: Callable, executor: str) -> None:
+        """校验执行方式，process 方式登记函数供子进程查找.
+
+        Args:
+            func: 任务函数
+            executor: 执行方式
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unsupported task executor: {executor}")
+        if executor == "process":
+            _process_functions[f"{func.__module__}:{func.__qualname__}"] = func
+
+    async def _call(
+        self, func: Callable, args: Any, kwargs: Dict[str, Any], executor: str
+    ) -> Any:
+        """按执行方式调用任务函数.
+
+        Args:
+            func: 任务函数
+            args: 位置参数
+            kwargs: 关键字参数
+            executor: 执行方式
+
+        Returns:
+            任务结果
+        """
+        if executor == "loop":
+            result = func(*args, **kwargs)
+            return await result if asyncio.iscoroutine(result) else result
+
+        loop = asyncio.get_running_loop()
+        if executor == "process":
+            call = partial(
+                _call_registered,
+                f"{func.__module__}:{func.__qualname__}",
+                tuple(args),
+                kwargs,
+            )
+        else:
+            call = partial(_call_sync, func, tuple(args), kwargs)
+        return await loop.run_in_executor(self._executor(executor), call)
+
+    def _executor(self, kind: str) -> Executor:
+        """返回线程池或进程池，首次使用时按配置的大小创建.
+
+        Args:
+            kind: thread 或 process
+
+        Returns:
+            执行器
+        """
+        pool = self._executors.get(kind)
+        if pool is None:
+            if kind == "process":
+                pool = ProcessPoolExecutor(max_workers=settings.TASK_PROCESS_POOL_SIZE)
+            else:
+                pool = ThreadPoolExecutor(
+                    max_workers=settings.TASK_THREAD_POOL_SIZE,
+                    thread_name_prefix="task",
+                )
+            self._executors[kind] = pool
+        return pool
+
+    async def shutdown(self, timeout: Optional[float] = None) -> None:
+        """停止接收新任务，等待提交队列和执行中的任务完成后关闭执行器.
+
+        超时仍未完成的任务会被取消，已交给线程池或进程池的调用无法中断，
+        关闭执行器时不再等待它们。
+
+        Args:
+            timeout: 最长等待时间（秒），默认为 TASK_SHUTDOWN_TIMEOUT
+        """
+        timeout = settings.TASK_SHUTDOWN_TIMEOUT if timeout is None else timeout
+        self._closing = True
+        if self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
+
+        # 调度协程处理完队列中剩余的提交后退出
+        async with self._submit_cond:
+            self._submit_cond.notify_all()
+        pending = {
+            *self._dispatchers,
+            *(run.task for run in self.registry.active() if run.task is not None),
+        }
+        drained = True
+        if pending:
+            _, not_done = await asyncio.wait(pending, timeout=timeout)
+            drained = not not_done
+            for task in not_done:
+                task.cancel()
+            if not_done:
+                logger.warning(
+                    "Task manager shutdown timed out, cancelling tasks",
+                    pending=len(not_done),
+                )
+                await asyncio.gather(*not_done, return_exceptions=True)
+        self._dispatchers = []
+
+        executors, self._executors = self._executors, {}
+        for pool in executors.values():
+            await asyncio.to_thread(pool.shutdown, wait=drained, cancel_futures=True)
+        logger.info("Task manager stopped", drained=drained)
+
+    @asynccontextmanager
+    async def _slot(self, task_name: str) -> AsyncGenerator[None, None]:
+        """获取同名任务和全局的执行名额.
+
+        始终先获取同名限制再获取全局限制，避免交叉等待造成死锁。
+
+        Args:
+            task_name: 任务名称
+        """
+        start = time.monotonic()
+        name_limit = self._name_limits.get(task_name)
+        if name_limit is not None:
+            await name_limit.acquire()
+        try:
+            async with self._global_limit:
+                task_wait_seconds.labels(name=task_name, stage="slot").observe(
+                    time.monotonic() - start
+                )
+                running = task_running.labels(name=task_name)
+                running.inc()
+                try:
+                    yield
+                finally:
+                    running.dec()
+        finally:
+            if name_limit is not None:
+                name_limit.release()
+
+    async def submit(
+        self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> "asyncio.Future[T]":
+        """将任务放入有界提交队列，由调度协程异步执行.
+
+        队列长度上限为 TASK_SUBMIT_QUEUE_SIZE，已满时按 TASK_SUBMIT_OVERFLOW 处理：
+        block 等待队列有空位，drop_oldest 丢弃最早的提交，reject 抛出
+        TaskRejectedError。
+
+        Args:
+            func: 任务函数（通常是 background_task 装饰后的函数）
+            *args: 位置参数
+            **kwargs: 关键字参数
+
+        Returns:
+            任务完成时得到结果的Future，被丢弃时为 TaskDroppedError
+        """
+        if self._closing:
+            raise RuntimeError("Task manager is shutting down")
+        self._start_dispatchers()
+        name = getattr(func, "__name__", repr(func))
+        future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        # 调用方不等待结果时也不报告未获取的异常，失败已由重试逻辑记录
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        async with self._submit_cond:
+            if len(self._submissions) >= settings.TASK_SUBMIT_QUEUE_SIZE:
+                # 调用方已取消的提交不再占用队列
+                self._submissions = deque(
+                    item for item in self._submissions if not item.future.done()
+                )
+            if len(self._submissions) >= settings.TASK_SUBMIT_QUEUE_SIZE:
+                overflow = settings.TASK_SUBMIT_OVERFLOW
+                if overflow == "reject":
+                    task_submissions.labels(result="rejected").inc()
+                    raise TaskRejectedError(f"Task submit queue is full: {name}")
+                if overflow == "drop_oldest":
+                    dropped = self._submissions.popleft()
+                    if not dropped.future.done():
+                        dropped.future.set_exception(
+                            TaskDroppedError(
+                                f"Task dropped from full queue: {dropped.name}"
+                            )
+                        )
+                    task_submissions.labels(result="dropped").inc()
+                else:
+                    await self._submit_cond.wait_for(
+                        lambda: len(self._submissions) < settings.TASK_SUBMIT_QUEUE_SIZE
+                    )
+            self._submissions.append(_Submission(func, args, kwargs, future, name))
+            task_submissions.labels(result="accepted").inc()
+            self._submit_cond.notify_all()
+        return future
+
+    def _start_dispatchers(self) -> None:
+        """首次提交时启动 TASK_MAX_CONCURRENCY 个调度协程."""
+        if self._dispatchers:
+            return
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch())
+            for _ in range(settings.TASK_MAX_CONCURRENCY)
+        ]
+
+    async def _dispatch(self) -> None:
+        """从提交队列中取出任务并执行，关闭时处理完剩余提交后退出."""
+        while True:
+            async with self._submit_cond:
+                await self._submit_cond.wait_for(
+                    lambda: bool(self._submissions) or self._closing
+                )
+                if not self._submissions:
+                    return
+                submission = self._submissions.popleft()
+                self._submit_cond.notify_all()
+
+            try:
+                await self._execute_submission(submission)
+            except Exception as e:
+                # 单个提交出错不能结束调度协程，否则会永久减少一个并发名额
+                logger.error("Task dispatcher failed", name=submission.name, exc_info=e)
+
+    @staticmethod
+    async def _execute_submission(submission: _Submission) -> None:
+        """执行单个提交并设置其Future的结果.
+
+        Args:
+            submission: 提交
+        """
+        future = submission.future
+        if future.done():
+            # 调用方已取消，不再执行
+            return
+        task_wait_seconds.labels(name=submission.name, stage="queue").observe(
+            time.monotonic() - submission.enqueued_at
+        )
+        try:
+            result = await submission.func(*submission.args, **submission.kwargs)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    async def run_worker(
+        self, concurrency: Optional[int] = None, stop: Optional[asyncio.Event] = None
+    ) -> None:
+        """从持久化队列拉取并执行任务，直到 stop 被设置.
+
+        任务成功或重试耗尽后确认；工作进程中途退出时未确认的任务在可见性超时后
+        重新投递给其他工作进程。
+
+        Args:
+            concurrency: 同时执行的任务数，默认为 TASK_WORKER_CONCURRENCY
+            stop: 停止信号，设置后不再拉取新任务并等待执行中的任务完成
+        """
+        self.start()
+        concurrency = concurrency or settings.TASK_WORKER_CONCURRENCY
+        stop = stop or asyncio.Event()
+        consumer = f"{socket.gethostname()}-{os.getpid()}"
+        running: Set[asyncio.Task] = set()
+        if not self._handlers:
+            logger.warning("No durable tasks registered, worker will not run anything")
+        logger.info(
+            "Task worker started",
+            consumer=consumer,
+            backend=settings.TASK_QUEUE_BACKEND,
+            tasks=sorted(self._handlers),
+        )
+
+        try:
+            while not stop.is_set():
+                free = concurrency - len(running)
+                if free <= 0:
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                for queued in await self.queue.dequeue(consumer, free, wait=1.0):
+                    task = asyncio.create_task(self._process(queued, consumer))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+        except asyncio.CancelledError:
+            # 强制退出时中断执行中的任务，它们不会被确认，稍后重新投递
+            for task in running:
+                task.cancel()
+            raise
+        finally:
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            logger.info("Task worker stopped", consumer=consumer)
+
+    async def _process(self, queued: QueuedTask, consumer: str) -> None:
+        """执行队列中的单个任务并确认.
+
+        投递次数超过 TASK_MAX_DELIVERIES 的任务（例如反复导致工作进程崩溃）和
+        重试耗尽的任务移入死信记录，不再投递。执行期间定期续期可见性超时，
+        执行时间超过 TASK_VISIBILITY_TIMEOUT 的任务不会被其他工作进程重复执行。
+
+        Args:
+            queued: 队列任务
+            consumer: 消费者名称
+        """
+        if queued.deliveries > settings.TASK_MAX_DELIVERIES:
+            await self._dead_letter(queued, "max_deliveries")
+            return
+
+        handler = self._handlers.get(queued.name)
+        if handler is None:
+            # 不确认，超时后由注册了该任务的工作进程处理
+            logger.warning("No handler for queued task", name=queued.name)
+            return
+
+        if queued.redelivered:
+            queued_tasks.labels(name=queued.name, result="redelivered").inc()
+        heartbeat = asyncio.create_task(self._keep_leased(queued, consumer))
+        try:
+            await handler(*queued.args, **queued.kwargs)
+        except CircuitOpenError:
+            # 熔断期间不确认，可见性超时后重新投递
+            queued_tasks.labels(name=queued.name, result="shed").inc()
+            return
+        except Exception:
+            # 重试耗尽，已记录错误日志
+            queued_tasks.labels(name=queued.name, result="failed").inc()
+            await self._dead_letter(queued, "failed")
+            return
+        finally:
+            heartbeat.cancel()
+        await self.queue.ack(queued)
+        queued_tasks.labels(name=queued.name, result="completed").inc()
+
+    async def _keep_leased(self, queued: QueuedTask, consumer: str) -> None:
+        """每隔三分之一可见性超时续期一次，直到被取消.
+
+        Args:
+            queued: 队列任务
+            consumer: 消费者名称
+        """
+        interval = settings.TASK_VISIBILITY_TIMEOUT / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend(queued, consumer)
+            except Exception as e:
+                # 续期失败时任务继续执行，最坏情况是超时后被重复投递
+                logger.warning(
+                    "Failed to extend queued task lease",
+                    name=queued.name,
+                    task_id=queued.id,
+                    exc_info=e,
+                )
+
+    async def _dead_letter(self, queued: QueuedTask, reason: str) -> None:
+        """将队列任务移入死信记录.
+
+        Args:
+            queued: 队列任务
+            reason: 原因
+        """
+        await self.queue.dead_letter(queued, reason)
+        queued_tasks.labels(name=queued.name, result="dead_lettered").inc()
+        logger.error(
+            "Queued task dead-lettered",
+            name=queued.name,
+            task_id=queued.id,
+            deliveries=queued.deliveries,
+            reason=reason,
+        )
+
     def schedule_task(
-        self, cron: str, name: Optional[str] = None, max_instances: int = 1
+        self,
+        cron: str,
+        name: Optional[str] = None,
+        max_instances: int = 1,
+        executor: str = "loop",
     ) -> Callable:
         """定时任务装饰器.
 
@@ -79,6 +692,7 @@ class TaskManager:
             cron: Cron表达式
             name: 任务名称
             max_instances: 最大并发实例数
+            executor: 执行方式，与 background_task 相同
 
         Returns:
             装饰器函数
@@ -86,11 +700,12 @@ class TaskManager:
 
         def decorator(func: Callable) -> Callable:
             task_name = name or func.__name__
+            self._register_executor(func, executor)
 
             @wraps(func)
             async def wrapper(*args: Any, **kwargs: Any) -> None:
                 try:
-                    await func(*args, **kwargs)
+                    await self._call(func, args, kwargs, executor)
                 except Exception as e:
                     logger.error(f"Scheduled task {task_name} failed", exc_info=e)
 
@@ -113,19 +728,8 @@ class TaskManager:
         Returns:
             活动任务列表
         """
-        tasks = []
         # 后台任务
-        for name, task in self._tasks.items():
-            tasks.append(
-                {
-                    "name": name,
-                    "type": "background",
-                    "status": "running" if not task.done() else "completed",
-                    "created_at": task.get_coro().cr_frame.f_locals.get(
-                        "start_time", "N/A"
-                    ),
-                }
-            )
+        tasks = [run.to_dict() for run in self.registry.active()]
 
         # 定时任务
         for job in self._scheduler.get_jobs():
@@ -134,33 +738,56 @@ class TaskManager:
                     "name": job.name,
                     "type": "scheduled",
                     "status": "scheduled",
-                    "next_run": job.next_run_time.strftime("%Y-%m-%d %H:%M:%S")
-                    if job.next_run_time
-                    else "N/A",
+                    "next_run": (
+                        job.next_run_time.strftime("%Y-%m-%d %H:%M:%S")
+                        if job.next_run_time
+                        else "N/A"
+                    ),
                 }
             )
 
         return tasks
 
+    def get_task(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """按运行ID查询后台任务.
+
+        Args:
+            run_id: 运行ID
+
+        Returns:
+            运行信息，不存在或已超出历史保留数量时为None
+        """
+        run = self.registry.get(run_id)
+        return run.to_dict() if run else None
+
+    def get_task_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """获取最近结束的后台任务，最新的在前.
+
+        Args:
+            limit: 返回数量，None 表示全部保留的记录
+
+        Returns:
+            运行信息列表
+        """
+        return [run.to_dict() for run in self.registry.history(limit)]
+
     async def cancel_task(self, name: str) -> bool:
         """取消任务.
 
         Args:
-            name: 任务名称
+            name: 运行ID、后台任务名称（取消该名称的所有运行）或定时任务名称
 
         Returns:
             是否成功取消
         """
         # 取消后台任务
-        if name in self._tasks:
-            task = self._tasks[name]
-            if not task.done():
+        run = self.registry.get(name)
+        runs = [run] if run else self.registry.active(name)
+        tasks = [run.task for run in runs if run.task is not None]
+        if tasks:
+            for task in tasks:
                 task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-            del self._tasks[name]
+            await asyncio.gather(*tasks, return_exceptions=True)
             return True
 
         # 取消定时任务
@@ -174,3 +801,5 @@ class TaskManager:
 
 # 全局任务管理器实例
 task_manager = TaskManager()
+# 指标是进程级的，只反映全局实例的提交队列，测试等场景创建的实例不覆盖它
+task_submit_queue_depth.set_function(lambda: len(task_manager._submissions))
@@ -3,8 +3,6 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
-from src.core.cache import cache
-from src.core.database import db
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -60,6 +58,10 @@ class HealthCheck:
         Returns:
             就绪状态信息
         """
+        # 延迟导入，避免core模块引用metrics时产生循环导入
+        from src.core.cache import cache
+        from src.core.database import db
+
         db_status = await db.check_connection()
         cache_status = await cache.check_connection()
         storage_status = await self._check_storage()
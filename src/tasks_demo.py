@@ -34,6 +34,19 @@ async def clean_expired_cache() -> None:
     logger.info("缓存清理完成")
 
 
+@task_manager.background_task(name="report_generator", durable=True)
+async def generate_report(report_id: str) -> None:
+    """生成报表的持久化任务，调用时只入队，由 `cli worker` 工作进程执行.
+
+    Args:
+        report_id: 报表ID
+    """
+    logger.info(f"开始生成报表: {report_id}")
+    # 模拟生成报表
+    await asyncio.sleep(1)
+    logger.info(f"报表生成完成: {report_id}")
+
+
 @task_manager.schedule_task(cron="*/5 * * * *", name="stats_collector")
 async def collect_stats() -> None:
     """每5分钟收集统计数据的定时任务."""
@@ -47,7 +60,7 @@ async def collect_stats() -> None:
             "cpu_usage": "25%",  # 示例值
         }
         # 保存到缓存
-        await cache.set(f"stats:{stats['timestamp']}", str(stats), expire=3600)  # 1小时过期
+        await cache.set(f"stats:{stats['timestamp']}", stats, expire=3600)  # 1小时过期
         logger.info("统计数据收集完成")
     except Exception as e:
         logger.error("统计数据收集失败", exc_info=e)
@@ -67,10 +80,16 @@ async def daily_backup() -> None:
 
 async def run_task_demo() -> None:
     """运行任务示例."""
+    task_manager.start()
+
     # 启动后台任务
     await process_data(["item1", "item2", "item3"])
     await clean_expired_cache()
 
+    # 提交持久化任务
+    task_id = await generate_report("daily")
+    logger.info(f"报表任务已入队: {task_id}")
+
     # 查看活动任务
     tasks = task_manager.get_active_tasks()
     logger.info(f"活动任务: {tasks}")
@@ -83,6 +102,8 @@ async def run_task_demo() -> None:
     await task_manager.cancel_task("stats_collector")
     logger.info("已取消统计数据收集任务")
 
+    await task_manager.shutdown()
+
 
 if __name__ == "__main__":
     asyncio.run(run_task_demo())
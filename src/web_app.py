@@ -7,6 +7,9 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from src.core.cache import cache
+from src.core.database import db
+from src.core.tasks import task_manager
 from src.monitoring import health, metrics
 from src.utils.logging import get_logger
 
@@ -64,6 +67,27 @@ app.add_middleware(MetricsMiddleware)
 app.mount("/metrics", metrics_app)
 
 
+@app.on_event("startup")
+async def startup() -> None:
+    """启动时预热缓存连接池并启动定时任务调度器.
+
+    Redis不可用时只记录警告并继续启动，由就绪检查报告缓存状态。
+    """
+    try:
+        await cache.warmup()
+    except Exception as e:
+        logger.warning("Cache warmup failed, continuing without it", exc_info=e)
+    task_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """关闭时等待后台任务完成并释放数据库和缓存连接."""
+    await task_manager.shutdown()
+    await db.disconnect()
+    await cache.disconnect()
+
+
 @app.get("/")
 async def root() -> Dict[str, str]:
     """根路径处理器.
@@ -111,7 +135,7 @@ async def readiness() -> Dict[str, str]:
     Raises:
         HTTPException: 当服务未就绪时
     """
-    status = health.check_readiness()
+    status = await health.check_readiness()
     if status.status != "ready":
         raise HTTPException(status_code=503, detail="Service not ready")
     return {"status": "ready"}
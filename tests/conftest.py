@@ -0,0 +1,15 @@
+"""测试公共夹具."""
+import pytest
+
+from src.config.settings import settings
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    """使用独立的进程内Redis替身."""
+    pytest.importorskip("fakeredis")
+    from src.core import fake_redis as fake_redis_module
+
+    monkeypatch.setattr(settings, "REDIS_MODE", "fake")
+    monkeypatch.setattr(settings, "REDIS_FAKE_LATENCY", 0.0)
+    monkeypatch.setattr(fake_redis_module, "_server", None)
@@ -0,0 +1,232 @@
+"""缓存管理器测试，使用进程内Redis替身."""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+from src.config.settings import settings
+from src.core import cache as cache_module
+from src.core.cache import _MISSING, CacheManager, LocalCache
+
+
+async def _eventually(condition: Callable[[], bool], timeout: float = 1.0) -> None:
+    """等待条件成立，超时则测试失败."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def managers(fake_redis: None, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """创建共享同一Redis替身、启用本地缓存的两个缓存管理器."""
+    monkeypatch.setattr(settings, "CACHE_LOCAL_ENABLED", True)
+    monkeypatch.setattr(settings, "CACHE_TTL_JITTER", 0.0)
+    created = [CacheManager(), CacheManager()]
+    for manager in created:
+        await manager.connect()
+    yield created
+    for manager in created:
+        await manager.disconnect()
+
+
+def test_local_cache_lru_eviction() -> None:
+    """lru 策略淘汰最久未访问的条目."""
+    local = LocalCache(max_size=2, ttl=10)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("b") is _MISSING
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+
+def test_local_cache_fifo_eviction() -> None:
+    """fifo 策略淘汰最早写入的条目，与访问顺序无关."""
+    local = LocalCache(max_size=2, ttl=10, policy="fifo")
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("a") is _MISSING
+    assert len(local) == 2
+
+
+def test_local_cache_expiry_and_prefix() -> None:
+    """过期条目和指定前缀的条目被移除."""
+    local = LocalCache(max_size=10, ttl=10)
+    local.set("gone", 1, ttl=0)
+    local.set("short", 1, ttl=0.01)
+    local.set("ns:a", 1)
+    local.set("ns:b", 2)
+    local.set("other", 3)
+    time.sleep(0.02)
+
+    local.delete_prefix("ns:")
+
+    assert local.get("gone") is _MISSING
+    assert local.get("short") is _MISSING
+    assert local.get("ns:a") is _MISSING
+    assert local.get("other") == 3
+
+
+def test_local_cache_rejects_unknown_policy() -> None:
+    """不支持的淘汰策略抛出 ValueError."""
+    with pytest.raises(ValueError):
+        LocalCache(max_size=1, ttl=1, policy="lfu")
+
+
+async def test_local_cache_invalidated_across_instances(
+    managers: List[CacheManager],
+) -> None:
+    """一个实例写入后，其他实例的本地缓存通过发布/订阅失效."""
+    writer, reader = managers
+    await writer.set("user:1", {"name": "old"})
+    assert await reader.get("user:1") == {"name": "old"}
+
+    await writer.set("user:1", {"name": "new"})
+    await _eventually(lambda: reader._local.get("user:1") is _MISSING)  # type: ignore
+
+    assert await reader.get("user:1") == {"name": "new"}
+
+
+async def test_clear_namespace(managers: List[CacheManager]) -> None:
+    """清除命名空间只删除该命名空间的键，并使其他实例的本地缓存失效."""
+    writer, reader = managers
+    users = writer.namespace("users")
+    await users.set_many({"1": "a", "2": "b"})
+    await writer.set("orders:1", "c")
+    assert await reader.namespace("users").get("1") == "a"
+
+    removed = await users.clear()
+
+    assert removed == 2
+    await _eventually(lambda: reader._local.get("users:1") is _MISSING)  # type: ignore
+    assert await reader.namespace("users").get_many(["1", "2"]) == {
+        "1": None,
+        "2": None,
+    }
+    assert await reader.get("orders:1") == "c"
+
+
+async def test_cached_coalesces_concurrent_misses(
+    managers: List[CacheManager],
+) -> None:
+    """同一缓存键的并发未命中只计算一次."""
+    manager = managers[0]
+    calls: List[int] = []
+
+    @manager.cached(ttl=60, key="square:{0}")
+    async def square(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.02)
+        return x * x
+
+    results = await asyncio.gather(*(square(3) for _ in range(10)))
+
+    assert results == [9] * 10
+    assert calls == [3]
+    assert await square(3) == 9
+    assert calls == [3]
+
+
+async def _store_entry(manager: CacheManager, key: str, **entry: Any) -> None:
+    """直接写入缓存装饰器格式的条目."""
+    await manager.set(key, {"value": "old", "delta": 0.0, **entry}, expire=60)
+
+
+async def test_cached_serves_stale_while_refreshing(
+    managers: List[CacheManager],
+) -> None:
+    """宽限期内返回旧值，同时在后台刷新."""
+    manager = managers[0]
+    calls: Dict[str, int] = {"n": 0}
+
+    @manager.cached(ttl=60, key="report", stale_ttl=60)
+    async def report() -> str:
+        calls["n"] += 1
+        return "new"
+
+    await _store_entry(manager, "report", fresh_until=time.time() - 1)
+
+    assert await report() == "old"
+    await _eventually(lambda: not manager._inflight)
+    assert calls["n"] == 1
+    assert await report() == "new"
+    assert calls["n"] == 1
+
+
+async def test_cached_refreshes_early_with_xfetch(
+    managers: List[CacheManager],
+) -> None:
+    """计算耗时相对剩余新鲜期很长时，命中的同时提前刷新."""
+    manager = managers[0]
+    calls: Dict[str, int] = {"n": 0}
+
+    @manager.cached(ttl=60, key="slow", beta=1.0)
+    async def slow() -> str:
+        calls["n"] += 1
+        return "new"
+
+    await _store_entry(manager, "slow", fresh_until=time.time() + 1, delta=1000.0)
+
+    assert await slow() == "old"
+    await _eventually(lambda: not manager._inflight)
+    assert calls["n"] == 1
+    assert await slow() == "new"
+
+
+async def test_cached_without_beta_does_not_refresh_early(
+    managers: List[CacheManager],
+) -> None:
+    """未设置 beta 时新鲜期内的命中不会触发刷新."""
+    manager = managers[0]
+    calls: Dict[str, int] = {"n": 0}
+
+    @manager.cached(ttl=60, key="plain")
+    async def plain() -> str:
+        calls["n"] += 1
+        return "new"
+
+    await _store_entry(manager, "plain", fresh_until=time.time() + 1, delta=1000.0)
+
+    assert await plain() == "old"
+    assert not manager._inflight
+    assert calls["n"] == 0
+
+
+async def test_cached_jitters_ttl_once(
+    managers: List[CacheManager], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """新鲜期只抖动一次，Redis过期时间等于抖动后的新鲜期加宽限期."""
+    manager = managers[0]
+    monkeypatch.setattr(settings, "CACHE_TTL_JITTER", 0.5)
+    monkeypatch.setattr(cache_module.random, "uniform", lambda low, high: high)
+
+    @manager.cached(ttl=10, key="jittered", stale_ttl=10)
+    async def jittered() -> str:
+        return "value"
+
+    await jittered()
+    entry = await manager.get("jittered")
+    pttl = await (await manager.client()).pttl("jittered")
+
+    assert entry["fresh_until"] - time.time() == pytest.approx(15, abs=1)
+    assert pttl == pytest.approx(25000, abs=1000)
+
+
+async def test_local_cache_returns_copies(managers: List[CacheManager]) -> None:
+    """修改本地缓存返回的对象不影响缓存，结果与从Redis读取时一致."""
+    manager = managers[0]
+    await manager.set("profile", {"tags": ["a"], "pair": (1, 2)})
+
+    first = await manager.get("profile")
+    first["tags"].append("b")
+    many = await manager.get_many(["profile"])
+    many["profile"]["tags"].clear()
+
+    assert await manager.get("profile") == {"tags": ["a"], "pair": [1, 2]}
@@ -0,0 +1,57 @@
+"""缓存值序列化测试."""
+from typing import Any
+
+import pytest
+
+from src.core.serialization import Serializer
+
+VALUE = {"name": "报表", "items": [1, 2.5, None, True], "nested": {"k": "v"}}
+
+
+@pytest.mark.parametrize("codec", ["json", "msgpack", "pickle"])
+def test_round_trip(codec: str) -> None:
+    """各编解码器编码后可以解码回原值."""
+    if codec == "msgpack":
+        pytest.importorskip("msgpack")
+    serializer = Serializer(codec)
+
+    assert serializer.loads(serializer.dumps(VALUE)) == VALUE
+
+
+@pytest.mark.parametrize("compression", ["zstd", "lz4"])
+def test_compression_above_threshold(compression: str) -> None:
+    """超过阈值的数据被压缩并在头部标记，读取时自动解压."""
+    pytest.importorskip("zstandard" if compression == "zstd" else "lz4")
+    serializer = Serializer("json", compression, compression_threshold=64)
+    large = {"data": "x" * 1000}
+
+    small_payload = serializer.dumps(VALUE)
+    large_payload = serializer.dumps(large)
+
+    assert small_payload[1] == 0
+    assert large_payload[1] != 0
+    assert len(large_payload) < 1000
+    assert serializer.loads(large_payload) == large
+
+
+def test_reads_other_codecs() -> None:
+    """按头部标记识别编解码器，与读取方自身的配置无关."""
+    payload = Serializer("pickle").dumps(VALUE)
+
+    assert Serializer("json").loads(payload) == VALUE
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [(None, None), (b"", ""), (b"plain text", "plain text"), ("旧值".encode(), "旧值")],
+)
+def test_legacy_values_decoded_as_text(data: Any, expected: Any) -> None:
+    """没有头部标记的旧数据按UTF-8字符串返回."""
+    assert Serializer().loads(data) == expected
+
+
+@pytest.mark.parametrize("codec, compression", [("yaml", None), ("json", "gzip")])
+def test_unsupported_options(codec: str, compression: Any) -> None:
+    """不支持的编解码器或压缩算法抛出 ValueError."""
+    with pytest.raises(ValueError):
+        Serializer(codec, compression)
@@ -0,0 +1,121 @@
+"""持久化任务队列后端测试."""
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from typing import Any, List, Tuple
+
+import pytest
+
+from src.core.cache import cache
+from src.core.task_queue import (
+    MemoryTaskQueue,
+    RedisTaskQueue,
+    SQLiteTaskQueue,
+    TaskQueue,
+)
+
+VISIBILITY = 0.2
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+async def queue(request: pytest.FixtureRequest, tmp_path: Path) -> Any:
+    """按参数创建各后端的队列，可见性超时很短以便测试重新投递."""
+    backend: TaskQueue
+    if request.param == "memory":
+        backend = MemoryTaskQueue(VISIBILITY)
+    elif request.param == "sqlite":
+        backend = SQLiteTaskQueue(str(tmp_path / "tasks.db"), VISIBILITY)
+    else:
+        request.getfixturevalue("fake_redis")
+        backend = RedisTaskQueue(f"tasks-{uuid.uuid4().hex}", "workers", VISIBILITY)
+    yield backend
+    await backend.close()
+    # Redis后端使用全局缓存的连接，不能跨事件循环复用
+    await cache.disconnect()
+
+
+async def _dead_letters(queue: TaskQueue) -> List[Tuple[str, str]]:
+    """读取死信记录.
+
+    Returns:
+        (任务名称, 原因) 列表
+    """
+    if isinstance(queue, MemoryTaskQueue):
+        return [(task.name, reason) for task, reason in queue.dead_letters]
+    if isinstance(queue, SQLiteTaskQueue):
+        rows = await queue._run(
+            lambda conn: conn.execute(
+                "SELECT payload, reason FROM task_dead_letter"
+            ).fetchall()
+        )
+        return [(json.loads(payload)["name"], reason) for payload, reason in rows]
+    client = await queue._client()  # type: ignore
+    entries = await client.xrange(f"{queue._stream}:dead")  # type: ignore
+    return [
+        (RedisTaskQueue._decode((entry_id, fields)).name, fields[b"reason"].decode())
+        for entry_id, fields in entries
+    ]
+
+
+async def test_enqueue_dequeue_ack(queue: TaskQueue) -> None:
+    """取出的任务保留名称和参数，确认后不再投递."""
+    task_id = await queue.enqueue("report", [1, "a"], {"day": "2024-01-01"})
+
+    (task,) = await queue.dequeue("worker-1", 10, wait=0.01)
+
+    assert task.id == task_id
+    assert (task.name, task.args, task.kwargs) == (
+        "report",
+        [1, "a"],
+        {"day": "2024-01-01"},
+    )
+    assert task.deliveries == 1
+    assert not task.redelivered
+
+    await queue.ack(task)
+    await asyncio.sleep(VISIBILITY * 1.5)
+    assert await queue.dequeue("worker-1", 10, wait=0.01) == []
+
+
+async def test_unacked_task_redelivered(queue: TaskQueue) -> None:
+    """超过可见性超时未确认的任务重新投递，投递次数加一."""
+    await queue.enqueue("report", [], {})
+    (first,) = await queue.dequeue("worker-1", 10, wait=0.01)
+    assert await queue.dequeue("worker-2", 10, wait=0.01) == []
+
+    await asyncio.sleep(VISIBILITY * 1.5)
+    (again,) = await queue.dequeue("worker-2", 10, wait=0.01)
+
+    assert again.id == first.id
+    assert again.deliveries == 2
+    assert again.redelivered
+
+
+async def test_extend_keeps_task_invisible(queue: TaskQueue) -> None:
+    """续期后任务在原可见性超时之后仍不会重新投递."""
+    await queue.enqueue("report", [], {})
+    (task,) = await queue.dequeue("worker-1", 10, wait=0.01)
+
+    for _ in range(3):
+        await asyncio.sleep(VISIBILITY * 0.6)
+        await queue.extend(task, "worker-1")
+
+    assert await queue.dequeue("worker-2", 10, wait=0.01) == []
+
+
+async def test_dead_letter(queue: TaskQueue) -> None:
+    """移入死信的任务记录原因，不再投递."""
+    await queue.enqueue("report", [], {})
+    await queue.enqueue("cleanup", [], {})
+    tasks = await queue.dequeue("worker-1", 10, wait=0.01)
+
+    await queue.dead_letter(tasks[0], "failed")
+    await queue.dead_letter(tasks[1], "max_deliveries")
+
+    await asyncio.sleep(VISIBILITY * 1.5)
+    assert await queue.dequeue("worker-1", 10, wait=0.01) == []
+    assert await _dead_letters(queue) == [
+        ("report", "failed"),
+        ("cleanup", "max_deliveries"),
+    ]
@@ -0,0 +1,88 @@
+"""后台任务运行记录测试."""
+import asyncio
+
+import pytest
+
+from src.core.task_registry import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    PENDING,
+    RUNNING,
+    TaskRegistry,
+)
+
+
+async def _finished(registry: TaskRegistry, name: str, coro: object) -> str:
+    """登记并执行一次运行，返回运行ID."""
+    run = registry.create(name)
+    task = asyncio.ensure_future(coro)  # type: ignore
+    registry.attach(run, task)
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+    return run.id
+
+
+async def test_run_lifecycle() -> None:
+    """运行记录从登记、执行到完成依次更新状态."""
+    registry = TaskRegistry(history_size=10)
+    run = registry.create("report")
+    assert run.state == PENDING
+    assert run.duration is None
+
+    gate = asyncio.Event()
+    task = asyncio.create_task(gate.wait())
+    registry.attach(run, task)
+    registry.start_attempt(run)
+
+    assert run.state == RUNNING
+    assert run.attempts == 1
+    assert registry.active() == [run]
+    assert registry.active("report") == [run]
+    assert registry.active("other") == []
+
+    gate.set()
+    await task
+    await asyncio.sleep(0)
+
+    assert run.state == COMPLETED
+    assert run.task is None
+    assert run.duration is not None
+    assert registry.active() == []
+    assert registry.get(run.id) is run
+    assert run.to_dict()["status"] == COMPLETED
+
+
+async def test_failed_and_cancelled_runs() -> None:
+    """失败的运行记录异常，被取消的运行标记为已取消."""
+    registry = TaskRegistry(history_size=10)
+
+    async def boom() -> None:
+        raise ValueError("boom")
+
+    failed_id = await _finished(registry, "boom", boom())
+    cancelled = asyncio.ensure_future(asyncio.sleep(10))
+    run = registry.create("slow")
+    registry.attach(run, cancelled)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    failed = registry.get(failed_id)
+    assert failed is not None
+    assert failed.state == FAILED
+    assert "boom" in (failed.error or "")
+    assert run.state == CANCELLED
+
+
+@pytest.mark.parametrize("size, kept", [(0, 0), (2, 2), (10, 3)])
+async def test_history_is_bounded(size: int, kept: int) -> None:
+    """历史记录超过上限后淘汰最早的记录，最新的在前."""
+    registry = TaskRegistry(history_size=size)
+    ids = [await _finished(registry, "job", asyncio.sleep(0)) for _ in range(3)]
+
+    history = registry.history()
+
+    assert [run.id for run in history] == ids[::-1][:kept]
+    assert [run.id for run in registry.history(limit=1)] == ids[::-1][: min(kept, 1)]
+    assert registry.get(ids[0]) is (history[-1] if kept == 3 else None)
@@ -0,0 +1,127 @@
+"""重试预算与熔断器测试."""
+from typing import Dict
+
+import pytest
+
+from src.core import task_retry
+from src.core.task_retry import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    RetryBudget,
+    RetryPolicy,
+    backoff_delay,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Dict[str, float]:
+    """可手动推进的 time.monotonic."""
+    now = {"t": 1000.0}
+    monkeypatch.setattr(task_retry.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_backoff_delay_is_capped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """退避上限为 min(cap, base * 2^attempt)."""
+    monkeypatch.setattr(task_retry.random, "uniform", lambda low, high: high)
+
+    assert backoff_delay(0, 1, 100) == 1
+    assert backoff_delay(3, 1, 100) == 8
+    assert backoff_delay(10, 1, 100) == 100
+    assert RetryPolicy(retry_delay=2, max_retry_delay=5).delay(2) == 5
+
+
+def test_retry_budget(clock: Dict[str, float]) -> None:
+    """令牌耗尽后拒绝重试，执行存入和按时间补充令牌."""
+    budget = RetryBudget(ratio=0.5, min_per_second=0.1, capacity=2)
+
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+    clock["t"] += 10
+    assert budget.withdraw()
+
+
+def test_retry_budget_capacity(clock: Dict[str, float]) -> None:
+    """令牌数不超过容量."""
+    budget = RetryBudget(ratio=1, min_per_second=1, capacity=1)
+    clock["t"] += 100
+    for _ in range(5):
+        budget.deposit()
+
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def _breaker() -> CircuitBreaker:
+    """最近4次执行中一半失败即打开、10秒后半开的熔断器."""
+    return CircuitBreaker(
+        "job", error_rate=0.5, window=4, min_calls=4, reset_timeout=10
+    )
+
+
+def test_breaker_opens_on_error_rate(clock: Dict[str, float]) -> None:
+    """执行次数达到 min_calls 且错误率达到阈值时打开."""
+    breaker = _breaker()
+    for success in (True, False, True):
+        breaker.record(success)
+    assert breaker.state == CLOSED
+
+    breaker.record(False)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_probe(clock: Dict[str, float]) -> None:
+    """重置时间后只放行一次试探，成功则关闭，失败则重新打开."""
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False)
+
+    clock["t"] += 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock["t"] += 10
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_release_frees_probe(clock: Dict[str, float]) -> None:
+    """试探执行被取消后释放名额，下一次执行可以继续试探."""
+    breaker = _breaker()
+    for _ in range(4):
+        breaker.record(False)
+    clock["t"] += 10
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+
+
+def test_breaker_disabled_with_zero_error_rate() -> None:
+    """error_rate 为0时不熔断."""
+    breaker = CircuitBreaker("job", error_rate=0, window=4, min_calls=1)
+    for _ in range(10):
+        breaker.record(False)
+
+    assert breaker.state == CLOSED
+    assert breaker.allow()
@@ -0,0 +1,181 @@
+"""任务管理器并发限制与提交队列测试."""
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from src.config.settings import settings
+from src.core.tasks import TaskDroppedError, TaskManager, TaskRejectedError
+
+
+@pytest.fixture
+def small_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    """缩小全局并发数和提交队列长度."""
+    monkeypatch.setattr(settings, "TASK_MAX_CONCURRENCY", 2)
+    monkeypatch.setattr(settings, "TASK_SUBMIT_QUEUE_SIZE", 2)
+
+
+@pytest.fixture
+async def manager(small_limits: None) -> Any:
+    """创建独立的任务管理器，测试结束后关闭."""
+    tm = TaskManager()
+    yield tm
+    await tm.shutdown(timeout=1)
+
+
+def _tracked(tm: TaskManager, peaks: Dict[str, int], **options: Any) -> Any:
+    """注册记录最大并发数的后台任务."""
+    name = options.pop("name")
+
+    @tm.background_task(name=name, max_retries=0, **options)
+    async def job(delay: float) -> None:
+        peaks["current"] += 1
+        peaks["max"] = max(peaks["max"], peaks["current"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            peaks["current"] -= 1
+
+    return job
+
+
+async def test_global_concurrency_limit(manager: TaskManager) -> None:
+    """同时执行的任务数不超过 TASK_MAX_CONCURRENCY."""
+    peaks = {"current": 0, "max": 0}
+    job = _tracked(manager, peaks, name="global_job")
+
+    await asyncio.gather(*(job(0.02) for _ in range(6)))
+
+    assert peaks["max"] == 2
+
+
+async def test_per_name_concurrency_limit(
+    monkeypatch: pytest.MonkeyPatch, small_limits: None
+) -> None:
+    """同名任务的并发数不超过 concurrency."""
+    monkeypatch.setattr(settings, "TASK_MAX_CONCURRENCY", 10)
+    tm = TaskManager()
+    peaks = {"current": 0, "max": 0}
+    job = _tracked(tm, peaks, name="named_job", concurrency=1)
+
+    await asyncio.gather(*(job(0.01) for _ in range(4)))
+
+    assert peaks["max"] == 1
+    await tm.shutdown(timeout=1)
+
+
+async def _fill_queue(tm: TaskManager, gate: asyncio.Event) -> List[Any]:
+    """占满调度协程和提交队列，返回队列中的Future."""
+
+    async def blocked() -> None:
+        await gate.wait()
+
+    # 两个调度协程各取走一个提交后阻塞，再放入两个占满队列
+    running = [await tm.submit(blocked) for _ in range(2)]
+    await asyncio.sleep(0)
+    queued = [await tm.submit(blocked) for _ in range(2)]
+    return running + queued
+
+
+async def test_overflow_reject(
+    manager: TaskManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """reject 策略在队列已满时抛出 TaskRejectedError."""
+    monkeypatch.setattr(settings, "TASK_SUBMIT_OVERFLOW", "reject")
+    gate = asyncio.Event()
+    futures = await _fill_queue(manager, gate)
+
+    with pytest.raises(TaskRejectedError):
+        await manager.submit(asyncio.sleep, 0)
+
+    gate.set()
+    await asyncio.gather(*futures)
+
+
+async def test_overflow_drop_oldest(
+    manager: TaskManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """drop_oldest 策略丢弃最早排队的提交."""
+    monkeypatch.setattr(settings, "TASK_SUBMIT_OVERFLOW", "drop_oldest")
+    gate = asyncio.Event()
+    futures = await _fill_queue(manager, gate)
+
+    newest = await manager.submit(asyncio.sleep, 0, "newest")
+
+    gate.set()
+    assert await newest == "newest"
+    with pytest.raises(TaskDroppedError):
+        await futures[2]
+    await asyncio.gather(*futures[:2], futures[3])
+
+
+async def test_overflow_drop_oldest_skips_cancelled(
+    manager: TaskManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """队列中已取消的提交不会导致 submit 出错，也不会挤掉其他提交."""
+    monkeypatch.setattr(settings, "TASK_SUBMIT_OVERFLOW", "drop_oldest")
+    gate = asyncio.Event()
+    futures = await _fill_queue(manager, gate)
+    futures[2].cancel()
+
+    newest = await manager.submit(asyncio.sleep, 0, "newest")
+
+    gate.set()
+    assert await newest == "newest"
+    await asyncio.gather(*futures[:2], futures[3])
+
+
+async def test_overflow_block(
+    manager: TaskManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """block 策略等待队列出现空位."""
+    monkeypatch.setattr(settings, "TASK_SUBMIT_OVERFLOW", "block")
+    gate = asyncio.Event()
+    futures = await _fill_queue(manager, gate)
+
+    pending = asyncio.create_task(manager.submit(asyncio.sleep, 0, "late"))
+    await asyncio.sleep(0.01)
+    assert not pending.done()
+
+    gate.set()
+    assert await (await pending) == "late"
+    await asyncio.gather(*futures)
+
+
+async def test_cancelled_future_keeps_dispatchers_alive(
+    manager: TaskManager,
+) -> None:
+    """调用方取消Future后调度协程继续工作."""
+    future = await manager.submit(asyncio.sleep, 0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(future, timeout=0.01)
+    await asyncio.sleep(0.06)
+
+    assert all(not task.done() for task in manager._dispatchers)
+    results = await asyncio.gather(
+        *[await manager.submit(asyncio.sleep, 0, i) for i in range(4)]
+    )
+    assert results == [0, 1, 2, 3]
+
+
+async def test_shutdown_drains_queued_submissions(
+    monkeypatch: pytest.MonkeyPatch, small_limits: None
+) -> None:
+    """shutdown 等待队列中已提交的任务执行完，只拒绝新的提交."""
+    monkeypatch.setattr(settings, "TASK_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "TASK_SUBMIT_QUEUE_SIZE", 4)
+    tm = TaskManager()
+    done: List[int] = []
+
+    @tm.background_task(name="drain_job", max_retries=0)
+    async def job(i: int) -> None:
+        await asyncio.sleep(0.01)
+        done.append(i)
+
+    futures = [await tm.submit(job, i) for i in range(4)]
+    await tm.shutdown(timeout=1)
+
+    assert done == [0, 1, 2, 3]
+    await asyncio.gather(*futures)
+    with pytest.raises(RuntimeError):
+        await tm.submit(job, 4)